@@ -0,0 +1,203 @@
+import gzip
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.db import connections, transaction
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+VERSION_KEY = 'version:{}'
+PAYLOAD_KEY = 'payload:{}:{}'
+COUNT_VERSION = 'count:{}'
+COUNT_KEY = 'count:{}:{}:{}'
+LIST_KEY = 'list:{}:{}'
+STATS_KEY = 'stats:{}:{}'
+HIT, MISS = 'hit', 'miss'
+
+
+def get_version(name):
+    key = VERSION_KEY.format(name)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), None)
+        return cache.get(key)
+    return version
+
+
+def get_versions(names):
+    keys = {VERSION_KEY.format(name): name for name in names}
+    versions = cache.get_many(keys)
+    for key in keys.keys() - versions.keys():
+        versions[key] = get_version(keys[key])
+    return [versions[key] for key in sorted(keys)]
+
+
+def bump_version(name):
+    version = time.time_ns()
+    cache.set(VERSION_KEY.format(name), version, None)
+    return version
+
+
+def bump_versions_on_commit(*names):
+    def bump():
+        for name in names:
+            bump_version(name)
+
+    transaction.on_commit(bump)
+
+
+def count_version_name(model):
+    return COUNT_VERSION.format(model._meta.label_lower)
+
+
+def estimate_count(queryset):
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql' or queryset.query.where:
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT reltuples FROM pg_class WHERE relname = %s',
+            [queryset.model._meta.db_table]
+        )
+        row = cursor.fetchone()
+    if row and row[0] >= settings.COUNT_ESTIMATE_THRESHOLD:
+        return int(row[0])
+    return None
+
+
+def get_count(queryset):
+    estimate = estimate_count(queryset)
+    if estimate is not None:
+        return estimate
+    queryset = queryset.order_by().values('pk')
+    try:
+        sql = str(queryset.query)
+    except EmptyResultSet:
+        return 0
+    key = COUNT_KEY.format(
+        queryset.model._meta.label_lower,
+        get_version(count_version_name(queryset.model)),
+        hashlib.md5(sql.encode()).hexdigest()
+    )
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, settings.COUNT_CACHE_TIMEOUT)
+    return count
+
+
+def is_not_modified(request, etag, last_modified):
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match:
+        etags = parse_etags(if_none_match)
+        return '*' in etags or etag in etags
+    if_modified_since = parse_http_date_safe(
+        request.META.get('HTTP_IF_MODIFIED_SINCE', '')
+    )
+    return bool(if_modified_since) and last_modified <= if_modified_since
+
+
+def set_validators(response, etag, last_modified, cache_control='no-cache'):
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    response['Cache-Control'] = cache_control
+
+
+class PrerenderedListMixin:
+    cache_name = None
+
+    def render_payload(self):
+        body = JSONRenderer().render(
+            self.get_serializer(self.get_queryset(), many=True).data
+        )
+        return body, gzip.compress(body)
+
+    def list(self, request, *args, **kwargs):
+        version = get_version(self.cache_name)
+        last_modified = version // 10 ** 9
+        use_gzip = 'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', '')
+        etag = '"{}-{}{}"'.format(
+            self.cache_name, version, '-gzip' if use_gzip else ''
+        )
+        if is_not_modified(request, etag, last_modified):
+            response = HttpResponseNotModified()
+        else:
+            key = PAYLOAD_KEY.format(self.cache_name, version)
+            payload = cache.get(key)
+            if payload is None:
+                payload = self.render_payload()
+                cache.set(key, payload, settings.PAYLOAD_CACHE_TIMEOUT)
+            body, compressed = payload
+            response = HttpResponse(
+                compressed if use_gzip else body,
+                content_type='application/json'
+            )
+            if use_gzip:
+                response['Content-Encoding'] = 'gzip'
+        set_validators(response, etag, last_modified)
+        response['Vary'] = 'Accept-Encoding'
+        return response
+
+
+def record_cache_result(prefix, result):
+    key = STATS_KEY.format(prefix, result)
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+
+
+def get_cache_stats(prefix):
+    return {
+        result: cache.get(STATS_KEY.format(prefix, result), 0)
+        for result in (HIT, MISS)
+    }
+
+
+def reset_cache_stats(prefix):
+    cache.delete_many([
+        STATS_KEY.format(prefix, result) for result in (HIT, MISS)
+    ])
+
+
+class AnonymousListCacheMixin:
+    list_cache_prefix = None
+
+    def get_list_version_names(self):
+        raise NotImplementedError
+
+    def get_list_cache_key(self):
+        request = self.request
+        query = sorted(
+            (name, sorted(value for value in values if value))
+            for name, values in request.query_params.lists()
+        )
+        digest = hashlib.md5(repr((
+            request.get_host(),
+            query,
+            get_versions(self.get_list_version_names())
+        )).encode()).hexdigest()
+        return LIST_KEY.format(self.list_cache_prefix, digest)
+
+    def list(self, request, *args, **kwargs):
+        if not request.user.is_anonymous:
+            return super().list(request, *args, **kwargs)
+        key = self.get_list_cache_key()
+        data = cache.get(key)
+        if data is not None:
+            record_cache_result(self.list_cache_prefix, HIT)
+            response = Response(data)
+            response['X-Cache'] = 'HIT'
+            return response
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, response.data, settings.LIST_CACHE_TIMEOUT)
+        record_cache_result(self.list_cache_prefix, MISS)
+        response['X-Cache'] = 'MISS'
+        return response
@@ -0,0 +1,49 @@
+import csv
+import json
+
+from django.conf import settings
+
+
+class Echo:
+    def write(self, value):
+        return value
+
+
+def iter_txt(items):
+    yield f'{settings.SHOPPING_LIST_TITLE}:\n'
+    for number, item in enumerate(items, start=1):
+        yield (
+            f'{number}.  {item["ingredient__name"]} - '
+            f'{item["ingredient_amount"]}'
+            f' {item["ingredient__measurement_unit"]}\n'
+        )
+
+
+def iter_csv(items):
+    writer = csv.writer(Echo())
+    yield writer.writerow(('name', 'measurement_unit', 'amount'))
+    for item in items:
+        yield writer.writerow((
+            item['ingredient__name'],
+            item['ingredient__measurement_unit'],
+            item['ingredient_amount'],
+        ))
+
+
+def iter_json(items):
+    separator = '['
+    for item in items:
+        yield separator + json.dumps({
+            'name': item['ingredient__name'],
+            'measurement_unit': item['ingredient__measurement_unit'],
+            'amount': item['ingredient_amount'],
+        }, ensure_ascii=False)
+        separator = ','
+    yield ']' if separator == ',' else '[]'
+
+
+EXPORTS = {
+    'txt': (iter_txt, 'text/plain; charset=utf-8'),
+    'csv': (iter_csv, 'text/csv; charset=utf-8'),
+    'json': (iter_json, 'application/json'),
+}
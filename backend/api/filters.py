@@ -1,12 +1,37 @@
+from django.db.models import Exists, OuterRef
 from django_filters.rest_framework import FilterSet, filters
-from rest_framework.filters import SearchFilter
 
-from recipes.models import Ingredient, Recipe
+from api.caching import get_version
+from recipes.models import Favorite, Recipe, ShoppingCart, Tag
+from recipes.search import search_recipes
+
+
+class TagSlugs:
+    def __init__(self):
+        self._version = None
+        self._ids = {}
+
+    def get_ids(self):
+        version = get_version('tags')
+        if version != self._version:
+            self._ids = dict(Tag.objects.values_list('slug', 'id'))
+            self._version = version
+        return self._ids
+
+    def get_choices(self):
+        return [(slug, slug) for slug in sorted(self.get_ids())]
+
+
+tag_slugs = TagSlugs()
 
 
 class RecipeFilter(FilterSet):
+    search = filters.CharFilter(method='filter_search')
     author = filters.CharFilter(field_name='author__id')
-    tags = filters.AllValuesMultipleFilter(field_name='tags__slug')
+    tags = filters.MultipleChoiceFilter(
+        choices=tag_slugs.get_choices,
+        method='filter_tags'
+    )
     is_favorited = filters.BooleanFilter(
         method='get_is_favorited'
     )
@@ -17,26 +42,36 @@ class RecipeFilter(FilterSet):
     class Meta:
         model = Recipe
         fields = (
+            'search',
             'author',
             'tags',
             'is_favorited',
             'is_in_shopping_cart',
         )
 
-    def get_is_favorited(self, queryset, name, value):
-        if not value:
-            return queryset
-        return queryset.filter(favorite__user=self.request.user)
+    def filter_search(self, queryset, name, value):
+        return search_recipes(queryset, value)
 
-    def filter_is_in_shopping_cart(self, queryset, name, value):
+    def filter_tags(self, queryset, name, value):
+        ids = tag_slugs.get_ids()
+        return queryset.filter(Exists(Recipe.tags.through.objects.filter(
+            recipe_id=OuterRef('pk'),
+            tag_id__in=[ids[slug] for slug in value if slug in ids]
+        )))
+
+    def filter_user_recipes(self, queryset, model, value):
         if not value:
             return queryset
-        return queryset.filter(shopping_cart__user=self.request.user)
+        user = self.request.user
+        if user.is_anonymous:
+            return queryset.none()
+        return queryset.filter(Exists(model.objects.filter(
+            user=user,
+            recipe_id=OuterRef('pk')
+        )))
 
+    def get_is_favorited(self, queryset, name, value):
+        return self.filter_user_recipes(queryset, Favorite, value)
 
-class IngredientSearchFilter(SearchFilter):
-    search_param = 'name'
-
-    class Meta:
-        model = Ingredient
-        fields = ('name',)
+    def filter_is_in_shopping_cart(self, queryset, name, value):
+        return self.filter_user_recipes(queryset, ShoppingCart, value)
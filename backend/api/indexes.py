@@ -0,0 +1,190 @@
+import bisect
+import threading
+from collections import defaultdict
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+
+from api.caching import bump_version, get_version
+from recipes.models import Ingredient, IngredientRecipe
+
+
+def normalize(value):
+    return ' '.join(value.casefold().replace('ё', 'е').split())
+
+
+class IngredientIndex:
+    version_name = 'ingredients'
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._index = None
+        self._version = None
+
+    def _build(self):
+        rows = sorted(
+            (normalize(name), pk, name, measurement_unit)
+            for pk, name, measurement_unit in Ingredient.objects.values_list(
+                'id', 'name', 'measurement_unit'
+            )
+            if name
+        )
+        names = [row[0] for row in rows]
+        items = [
+            {'id': pk, 'name': name, 'measurement_unit': measurement_unit}
+            for _, pk, name, measurement_unit in rows
+        ]
+        tokens = sorted(
+            (token, position)
+            for position, name in enumerate(names)
+            for token in name.split()[1:]
+        )
+        return names, items, tokens
+
+    def _rebuild(self, version):
+        with self._lock:
+            if self._index is None or self._version != version:
+                self._index = self._build()
+                self._version = version
+            return self._index
+
+    def search(self, query, limit=None):
+        limit = limit or settings.INGREDIENT_SEARCH_LIMIT
+        query = normalize(query)
+        if not query:
+            return []
+        version = get_version(self.version_name)
+        index = self._index
+        if index is None or self._version != version:
+            index = self._rebuild(version)
+        names, items, tokens = index
+        prefix_hits = []
+        for position in range(bisect.bisect_left(names, query), len(names)):
+            if len(prefix_hits) >= limit or not names[position].startswith(
+                query
+            ):
+                break
+            prefix_hits.append(position)
+        token_hits = set()
+        for number in range(bisect.bisect_left(tokens, (query,)), len(tokens)):
+            token, position = tokens[number]
+            if not token.startswith(query):
+                break
+            token_hits.add(position)
+        token_hits.difference_update(prefix_hits)
+        positions = prefix_hits + sorted(token_hits)
+        return [items[position] for position in positions[:limit]]
+
+
+class RecipeIngredientIndex:
+    version_name = 'recipe_ingredients'
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._members = None
+        self._postings = None
+        self._recipe_ids = None
+        self._sizes = None
+        self._version = None
+
+    def _build(self):
+        members = defaultdict(set)
+        for recipe_id, ingredient_id in IngredientRecipe.objects.values_list(
+            'recipe_id', 'ingredient_id'
+        ).iterator():
+            members[recipe_id].add(ingredient_id)
+        postings = defaultdict(list)
+        for recipe_id in sorted(members):
+            for ingredient_id in members[recipe_id]:
+                postings[ingredient_id].append(recipe_id)
+        self._members = dict(members)
+        self._postings = {
+            ingredient_id: np.array(recipe_ids, dtype=np.int64)
+            for ingredient_id, recipe_ids in postings.items()
+        }
+        self._recipe_ids = np.array(sorted(members), dtype=np.int64)
+        self._sizes = np.array(
+            [len(members[recipe_id]) for recipe_id in sorted(members)],
+            dtype=np.int64
+        )
+
+    def _remove(self, recipe_id):
+        for ingredient_id in self._members.pop(recipe_id, ()):
+            posting = self._postings[ingredient_id]
+            self._postings[ingredient_id] = np.delete(
+                posting, np.searchsorted(posting, recipe_id)
+            )
+        position = np.searchsorted(self._recipe_ids, recipe_id)
+        if position < len(self._recipe_ids) and (
+            self._recipe_ids[position] == recipe_id
+        ):
+            self._recipe_ids = np.delete(self._recipe_ids, position)
+            self._sizes = np.delete(self._sizes, position)
+
+    def _add(self, recipe_id, ingredient_ids):
+        self._members[recipe_id] = ingredient_ids
+        for ingredient_id in ingredient_ids:
+            posting = self._postings.get(
+                ingredient_id, np.empty(0, dtype=np.int64)
+            )
+            self._postings[ingredient_id] = np.insert(
+                posting, np.searchsorted(posting, recipe_id), recipe_id
+            )
+        position = np.searchsorted(self._recipe_ids, recipe_id)
+        self._recipe_ids = np.insert(self._recipe_ids, position, recipe_id)
+        self._sizes = np.insert(self._sizes, position, len(ingredient_ids))
+
+    def update(self, recipe_ids):
+        members = defaultdict(set)
+        for recipe_id, ingredient_id in IngredientRecipe.objects.filter(
+            recipe_id__in=recipe_ids
+        ).values_list('recipe_id', 'ingredient_id'):
+            members[recipe_id].add(ingredient_id)
+        with self._lock:
+            is_current = self._members is not None and (
+                self._version == get_version(self.version_name)
+            )
+            version = bump_version(self.version_name)
+            if not is_current:
+                return
+            for recipe_id in recipe_ids:
+                self._remove(recipe_id)
+                if members[recipe_id]:
+                    self._add(recipe_id, members[recipe_id])
+            self._version = version
+
+    def schedule_update(self, recipe_ids):
+        transaction.on_commit(lambda: self.update(recipe_ids))
+
+    def search(self, ingredient_ids):
+        version = get_version(self.version_name)
+        with self._lock:
+            if self._members is None or self._version != version:
+                self._build()
+                self._version = version
+            postings = [
+                self._postings[ingredient_id]
+                for ingredient_id in ingredient_ids
+                if ingredient_id in self._postings
+            ]
+            if not postings:
+                return []
+            candidates, matched = np.unique(
+                np.concatenate(postings), return_counts=True
+            )
+            totals = self._sizes[
+                np.searchsorted(self._recipe_ids, candidates)
+            ]
+        missing = totals - matched
+        coverage = matched / totals
+        order = np.lexsort((-candidates, missing, -coverage))
+        return list(zip(
+            candidates[order].tolist(),
+            missing[order].tolist(),
+            coverage[order].tolist()
+        ))
+
+
+ingredient_index = IngredientIndex()
+recipe_ingredient_index = RecipeIngredientIndex()
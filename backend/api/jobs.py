@@ -0,0 +1,85 @@
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+from api.pdf import render_shopping_list
+
+PENDING = 'pending'
+READY = 'ready'
+FAILED = 'failed'
+SUFFIXES = {PENDING: '.pending', READY: '.pdf', FAILED: '.failed'}
+
+executor = ThreadPoolExecutor(
+    max_workers=settings.PDF_JOB_WORKERS,
+    thread_name_prefix='shopping-list'
+)
+slots = threading.BoundedSemaphore(settings.PDF_JOB_QUEUE_SIZE)
+
+
+def get_job_dir(user_id):
+    return os.path.join(settings.PDF_JOB_ROOT, str(user_id))
+
+
+def get_job_path(user_id, job_id, status):
+    return os.path.join(get_job_dir(user_id), job_id + SUFFIXES[status])
+
+
+def scan(path):
+    try:
+        return list(os.scandir(path))
+    except FileNotFoundError:
+        return []
+
+
+def remove_expired_jobs():
+    expired = time.time() - settings.PDF_JOB_TTL
+    for directory in scan(settings.PDF_JOB_ROOT):
+        if not directory.is_dir():
+            continue
+        for entry in scan(directory.path):
+            try:
+                if entry.stat().st_mtime < expired:
+                    os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+
+
+def render_job(user_id, job_id, items):
+    pending = get_job_path(user_id, job_id, PENDING)
+    try:
+        document = render_shopping_list(items)
+        path = get_job_path(user_id, job_id, READY)
+        with open(path + '.tmp', 'wb') as file:
+            file.write(document)
+        os.replace(path + '.tmp', path)
+    except Exception:
+        os.replace(pending, get_job_path(user_id, job_id, FAILED))
+        raise
+    else:
+        os.remove(pending)
+    finally:
+        slots.release()
+
+
+def submit_job(user_id, items):
+    if not slots.acquire(blocking=False):
+        return None
+    remove_expired_jobs()
+    os.makedirs(get_job_dir(user_id), exist_ok=True)
+    job_id = uuid.uuid4().hex
+    open(get_job_path(user_id, job_id, PENDING), 'w').close()
+    executor.submit(render_job, user_id, job_id, items)
+    return job_id
+
+
+def get_job_status(user_id, job_id):
+    expired = time.time() - settings.PDF_JOB_TTL
+    for status in (READY, PENDING, FAILED):
+        path = get_job_path(user_id, job_id, status)
+        if os.path.exists(path) and os.path.getmtime(path) >= expired:
+            return status, path
+    return None, None
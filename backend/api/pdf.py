@@ -0,0 +1,55 @@
+from functools import lru_cache
+from io import BytesIO
+
+from django.conf import settings
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfgen import canvas
+
+FONT_NAME = 'FreeSans'
+POSITION_X = 40
+FIRST_PAGE_Y = 650
+NEXT_PAGE_Y = 700
+BOTTOM_Y = 100
+LINE_HEIGHT = 30
+TITLE_FONT_SIZE = 36
+FIRST_PAGE_FONT_SIZE = 20
+NEXT_PAGE_FONT_SIZE = 24
+
+
+@lru_cache(maxsize=None)
+def register_font():
+    pdfmetrics.registerFont(TTFont(FONT_NAME, settings.PDF_FONT_PATH))
+    return FONT_NAME
+
+
+def render_shopping_list(items):
+    font = register_font()
+    buffer = BytesIO()
+    sheet = canvas.Canvas(buffer, pagesize=A4)
+    sheet.setTitle(settings.SHOPPING_LIST_TITLE)
+    sheet.setFont(font, TITLE_FONT_SIZE)
+    sheet.drawString(
+        POSITION_X,
+        FIRST_PAGE_Y + 40,
+        f'{settings.SHOPPING_LIST_TITLE}: '
+    )
+    sheet.setFont(font, FIRST_PAGE_FONT_SIZE)
+    position_y = FIRST_PAGE_Y
+    for number, item in enumerate(items, start=1):
+        if position_y < BOTTOM_Y:
+            position_y = NEXT_PAGE_Y
+            sheet.showPage()
+            sheet.setFont(font, NEXT_PAGE_FONT_SIZE)
+        sheet.drawString(
+            POSITION_X,
+            position_y,
+            f'{number}.  {item["ingredient__name"]} - '
+            f'{item["ingredient_amount"]}'
+            f' {item["ingredient__measurement_unit"]}'
+        )
+        position_y -= LINE_HEIGHT
+    sheet.showPage()
+    sheet.save()
+    return buffer.getvalue()
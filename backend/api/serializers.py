@@ -1,11 +1,16 @@
 from django.conf import settings
-from django.shortcuts import get_object_or_404
-from drf_extra_fields.fields import Base64ImageField
+from django.db import transaction
+from django.db.models import prefetch_related_objects
 from rest_framework import serializers
 from rest_framework.validators import UniqueTogetherValidator
 
+from api.indexes import recipe_ingredient_index
+from api.uploads import LimitedBase64ImageField, LimitedImageField
+from api.utils import bump_cart_versions, get_subscribed_author_ids
+from recipes.images import get_derivative_urls
 from recipes.models import (
-    Favorite, Ingredient, IngredientRecipe, Recipe, ShoppingCart, Tag
+    Favorite, Ingredient, IngredientRecipe, Recipe, ShoppingCart, Tag,
+    recipe_prefetches
 )
 from users.models import Follow, User
 
@@ -22,10 +27,7 @@ class CustomUserSerializer(serializers.ModelSerializer):
         request = self.context.get('request')
         if not request or request.user.is_anonymous:
             return False
-        return Follow.objects.filter(
-            user=request.user.id,
-            author=obj.id
-        ).exists()
+        return obj.id in get_subscribed_author_ids(request)
 
 
 class FavoriteSerializer(serializers.ModelSerializer):
@@ -54,16 +56,29 @@ class ShoppingCartSerializer(serializers.ModelSerializer):
         ]
 
 
+class ImageDerivativesField(serializers.ReadOnlyField):
+    def to_representation(self, image):
+        if not image:
+            return None
+        request = self.context.get('request')
+        return {
+            size_name: request.build_absolute_uri(url) if request else url
+            for size_name, url in get_derivative_urls(image).items()
+        }
+
+
 class RecipeShortSerializer(serializers.ModelSerializer):
+    images = ImageDerivativesField(source='image')
+
     class Meta:
         model = Recipe
         fields = ('id', 'name',
-                  'image', 'cooking_time')
+                  'image', 'images', 'cooking_time')
 
 
 class FollowListSerializer(CustomUserSerializer):
     recipes = serializers.SerializerMethodField(read_only=True)
-    recipes_count = serializers.SerializerMethodField(read_only=True)
+    recipes_count = serializers.ReadOnlyField(source='author.recipes_count')
     id = serializers.ReadOnlyField(source='author.id')
     email = serializers.ReadOnlyField(source='author.email')
     username = serializers.ReadOnlyField(source='author.username')
@@ -78,18 +93,17 @@ class FollowListSerializer(CustomUserSerializer):
                   'recipes_count')
 
     def get_recipes(self, obj):
-        recipes = obj.author.recipes.all()
         request = self.context.get('request')
         if not request or request.user.is_anonymous:
             return False
-        recipes_limit = request.query_params.get('recipes_limit')
-        if recipes_limit:
-            recipes = recipes[:int(recipes_limit)]
+        recipes = getattr(obj, 'author_recipes', None)
+        if recipes is None:
+            recipes = obj.author.recipes.all()
+            recipes_limit = request.query_params.get('recipes_limit')
+            if recipes_limit:
+                recipes = recipes[:int(recipes_limit)]
         return RecipeShortSerializer(recipes, many=True).data
 
-    def get_recipes_count(self, obj):
-        return obj.author.recipes.count()
-
 
 class FollowSerializer(CustomUserSerializer):
     class Meta:
@@ -160,6 +174,7 @@ class RecipeListSerializer(serializers.ModelSerializer):
         many=True
     )
     tags = TagSerializer(many=True)
+    images = ImageDerivativesField(source='image')
     is_favorited = serializers.SerializerMethodField(
         method_name='get_is_favorited'
     )
@@ -170,12 +185,15 @@ class RecipeListSerializer(serializers.ModelSerializer):
     class Meta:
         model = Recipe
         fields = ('id', 'author', 'name',
-                  'image', 'text', 'ingredients',
+                  'image', 'images', 'text', 'ingredients',
                   'tags', 'cooking_time',
                   'is_in_shopping_cart',
                   'is_favorited')
 
-    def _exist(self, model, obj):
+    def _exist(self, model, obj, annotation):
+        value = getattr(obj, annotation, None)
+        if value is not None:
+            return value
         request = self.context.get('request')
         if not request or request.user.is_anonymous:
             return False
@@ -185,10 +203,31 @@ class RecipeListSerializer(serializers.ModelSerializer):
         ).exists()
 
     def get_is_favorited(self, obj):
-        return self._exist(Favorite, obj)
+        return self._exist(Favorite, obj, 'is_favorited')
 
     def get_is_in_shopping_cart(self, obj):
-        return self._exist(ShoppingCart, obj)
+        return self._exist(ShoppingCart, obj, 'is_in_shopping_cart')
+
+
+class RecipeCoverageSerializer(RecipeListSerializer):
+    missing_ingredients = serializers.ReadOnlyField()
+    coverage = serializers.ReadOnlyField()
+
+    class Meta(RecipeListSerializer.Meta):
+        fields = RecipeListSerializer.Meta.fields + (
+            'missing_ingredients', 'coverage'
+        )
+
+
+class RecipeImageSerializer(serializers.ModelSerializer):
+    image = LimitedImageField()
+
+    class Meta:
+        model = Recipe
+        fields = ('image',)
+
+    def to_representation(self, instance):
+        return RecipeSerializer(instance, context=self.context).data
 
 
 class RecipeSerializer(serializers.ModelSerializer):
@@ -198,7 +237,7 @@ class RecipeSerializer(serializers.ModelSerializer):
     )
     ingredients = IngredientRecipeSerializer(many=True)
     author = CustomUserSerializer(read_only=True)
-    image = Base64ImageField()
+    image = LimitedBase64ImageField()
 
     class Meta:
         model = Recipe
@@ -207,35 +246,39 @@ class RecipeSerializer(serializers.ModelSerializer):
                   'text', 'cooking_time')
 
     def validate(self, data):
-        ingredients = self.initial_data.get('ingredients')
+        ingredients = data.get('ingredients')
         if not ingredients:
             raise serializers.ValidationError({
                 'ingredients': settings.WRONG_INGREDIENT_CHOOSE
             })
-        ingredients_list = []
+        ingredient_ids = {ingredient['id'] for ingredient in ingredients}
+        if len(ingredient_ids) != len(ingredients):
+            raise serializers.ValidationError({
+                'ingredients': settings.WRONG_UNIQUE_INGREDIENTS
+            })
+        if any(int(ingredient['amount']) <= 0 for ingredient in ingredients):
+            raise serializers.ValidationError({
+                'amount': settings.WRONG_INGREDIENT_AMOUNT
+            })
+        found = Ingredient.objects.in_bulk(ingredient_ids)
+        missing = ingredient_ids - found.keys()
+        if missing:
+            raise serializers.ValidationError({
+                'ingredients': settings.WRONG_INGREDIENTS_NOT_FOUND.format(
+                    ', '.join(map(str, sorted(missing)))
+                )
+            })
         for ingredient in ingredients:
-            ingredient_id = ingredient['id']
-            if ingredient_id in ingredients_list:
-                raise serializers.ValidationError({
-                    'ingredients': settings.WRONG_UNIQUE_INGREDIENTS
-                })
-            ingredients_list.append(ingredient_id)
-            if int(ingredient['amount']) <= 0:
-                raise serializers.ValidationError({
-                    'amount': settings.WRONG_INGREDIENT_AMOUNT
-                })
+            ingredient['ingredient'] = found[ingredient['id']]
         tags = self.initial_data.get('tags')
         if not tags:
             raise serializers.ValidationError({
                 'tags': settings.WRONG_TAG_CHOOSE
             })
-        tags_list = []
-        for tag in tags:
-            if tag in tags_list:
-                raise serializers.ValidationError({
-                    'tags': settings.WRONG_UNIQUE_TAGS
-                })
-            tags_list.append(tag)
+        if len(set(tags)) != len(tags):
+            raise serializers.ValidationError({
+                'tags': settings.WRONG_UNIQUE_TAGS
+            })
 
         cooking_time = self.initial_data.get('cooking_time')
         if int(cooking_time) <= 0:
@@ -251,11 +294,41 @@ class RecipeSerializer(serializers.ModelSerializer):
     def create_ingredients(self, recipe, ingredients):
         IngredientRecipe.objects.bulk_create(
             [IngredientRecipe(recipe=recipe,
-             ingredient=get_object_or_404(
-                 Ingredient, pk=ingredient['id']
-             ), amount=ingredient['amount'])
+             ingredient=ingredient['ingredient'],
+             amount=ingredient['amount'])
              for ingredient in ingredients])
 
+    def update_ingredients(self, recipe, ingredients):
+        current = {
+            item.ingredient_id: item
+            for item in recipe.ingredient_recipe.all()
+        }
+        amounts = {
+            ingredient['ingredient'].id: ingredient['amount']
+            for ingredient in ingredients
+        }
+        removed = current.keys() - amounts.keys()
+        if removed:
+            IngredientRecipe.objects.filter(
+                recipe=recipe,
+                ingredient__in=removed
+            ).delete()
+        changed = [
+            item for ingredient_id, item in current.items()
+            if ingredient_id in amounts
+            and item.amount != amounts[ingredient_id]
+        ]
+        for item in changed:
+            item.amount = amounts[item.ingredient_id]
+        IngredientRecipe.objects.bulk_update(changed, ['amount'])
+        added = [
+            ingredient for ingredient in ingredients
+            if ingredient['ingredient'].id not in current
+        ]
+        self.create_ingredients(recipe, added)
+        return bool(removed or changed or added)
+
+    @transaction.atomic
     def create(self, validated_data):
         ingredients = validated_data.pop('ingredients')
         tags = validated_data.pop('tags')
@@ -265,16 +338,20 @@ class RecipeSerializer(serializers.ModelSerializer):
         )
         recipe.tags.set(tags)
         self.create_ingredients(recipe, ingredients)
+        recipe_ingredient_index.schedule_update([recipe.id])
         return recipe
 
+    @transaction.atomic
     def update(self, instance, validated_data):
-        instance.tags.clear()
-        IngredientRecipe.objects.filter(recipe=instance).delete()
-        tags = validated_data.pop('tags')
-        ingredients = validated_data.pop('ingredients')
-        instance.tags.set(tags)
-        self.create_ingredients(instance, ingredients)
+        instance.tags.set(validated_data.pop('tags'))
+        if self.update_ingredients(
+            instance,
+            validated_data.pop('ingredients')
+        ):
+            bump_cart_versions([instance.id])
+            recipe_ingredient_index.schedule_update([instance.id])
         return super().update(instance, validated_data)
 
     def to_representation(self, instance):
-        return RecipeListSerializer(instance).data
+        prefetch_related_objects([instance], *recipe_prefetches())
+        return RecipeListSerializer(instance, context=self.context).data
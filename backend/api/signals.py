@@ -0,0 +1,92 @@
+from django.db.models.signals import (
+    m2m_changed, post_delete, post_save, pre_delete
+)
+from django.dispatch import receiver
+
+from api.caching import bump_versions_on_commit, count_version_name
+from api.indexes import recipe_ingredient_index
+from api.utils import (
+    bump_cart_versions, bump_recipe_versions, cart_version_name
+)
+from recipes.models import (
+    Favorite, Ingredient, IngredientRecipe, Recipe, ShoppingCart, Tag
+)
+from users.models import Follow, User
+
+
+@receiver((post_save, post_delete), sender=Ingredient)
+def invalidate_ingredients(**kwargs):
+    bump_versions_on_commit('ingredients')
+
+
+@receiver((post_save, post_delete), sender=IngredientRecipe)
+def update_recipe_ingredients(instance, **kwargs):
+    recipe_ingredient_index.schedule_update([instance.recipe_id])
+    bump_cart_versions([instance.recipe_id])
+
+
+@receiver((post_save, post_delete), sender=Tag)
+def invalidate_tags(**kwargs):
+    bump_versions_on_commit('tags')
+
+
+@receiver((post_save, post_delete), sender=ShoppingCart)
+def invalidate_cart(instance, **kwargs):
+    bump_versions_on_commit(
+        cart_version_name(instance.user_id),
+        count_version_name(Recipe)
+    )
+
+
+@receiver((post_save, post_delete), sender=Recipe)
+@receiver((post_save, post_delete), sender=Favorite)
+@receiver(m2m_changed, sender=Recipe.tags.through)
+def invalidate_recipe_counts(**kwargs):
+    bump_versions_on_commit(count_version_name(Recipe))
+
+
+@receiver((post_save, post_delete), sender=Follow)
+@receiver((post_save, post_delete), sender=User)
+def invalidate_user_counts(sender, **kwargs):
+    bump_versions_on_commit(count_version_name(sender))
+
+
+@receiver(post_save, sender=Recipe)
+@receiver(pre_delete, sender=Recipe)
+def invalidate_recipe_pages(instance, **kwargs):
+    bump_recipe_versions(
+        [instance.author_id],
+        instance.tags.values_list('id', flat=True)
+    )
+
+
+@receiver(m2m_changed, sender=Recipe.tags.through)
+def invalidate_tag_pages(instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if reverse:
+        recipes = Recipe.objects.filter(
+            tags=instance
+        ) if pk_set is None else Recipe.objects.filter(pk__in=pk_set)
+        bump_recipe_versions(
+            recipes.values_list('author_id', flat=True),
+            [instance.pk]
+        )
+    elif action == 'pre_clear':
+        bump_recipe_versions(
+            [instance.author_id],
+            instance.tags.values_list('id', flat=True)
+        )
+    else:
+        bump_recipe_versions([instance.author_id], pk_set)
+
+
+@receiver(post_save, sender=User)
+def invalidate_author_pages(instance, update_fields, **kwargs):
+    if update_fields != frozenset(('last_login',)):
+        bump_recipe_versions(
+            [instance.pk],
+            Recipe.tags.through.objects.filter(
+                recipe__author=instance
+            ).values_list('tag_id', flat=True).distinct()
+        )
@@ -0,0 +1,106 @@
+import pytest
+
+from api import indexes
+from api.caching import bump_version
+from api.indexes import RecipeIngredientIndex, recipe_ingredient_index
+from recipes.models import IngredientRecipe
+
+WHAT_TO_COOK_URL = '/api/recipes/what_to_cook/'
+
+
+@pytest.fixture
+def index():
+    return RecipeIngredientIndex()
+
+
+def test_search_ranks_by_coverage(index, ingredients, make_recipes):
+    # recipes use the first 1, 2 and 3 ingredients respectively
+    first, second, third = make_recipes(3)
+    results = index.search({ingredients[0].id, ingredients[1].id})
+    assert results == [
+        (second.id, 0, 1.0),
+        (first.id, 0, 1.0),
+        (third.id, 1, pytest.approx(2 / 3)),
+    ]
+    assert index.search({ingredients[4].id}) == []
+
+
+def test_update_is_incremental(index, ingredients, make_recipes):
+    recipe = make_recipes(1)[0]
+    index.search({ingredients[0].id})
+    IngredientRecipe.objects.create(
+        recipe=recipe, ingredient=ingredients[4], amount=1
+    )
+    index.update([recipe.id])
+    assert index.search({ingredients[4].id}) == [(recipe.id, 1, 0.5)]
+    recipe_id = recipe.id
+    recipe.delete()
+    index.update([recipe_id])
+    assert index.search({ingredients[0].id}) == []
+
+
+def test_update_does_not_adopt_foreign_version(
+    index, ingredients, make_recipes, monkeypatch
+):
+    first, second = make_recipes(2)
+    index.search({ingredients[0].id})
+    bump_version = indexes.bump_version
+
+    def bump_with_concurrent_change(name):
+        try:
+            return bump_version(name)
+        finally:
+            IngredientRecipe.objects.filter(recipe=second).delete()
+            bump_version(name)
+
+    monkeypatch.setattr(indexes, 'bump_version', bump_with_concurrent_change)
+    index.update([first.id])
+    assert index.search({ingredients[0].id}) == [(first.id, 0, 1.0)]
+
+
+@pytest.mark.parametrize('params', [{}, {'cursor': ''}])
+def test_what_to_cook_uses_page_pagination(
+    client, ingredients, make_recipes, params
+):
+    first, second = make_recipes(2)
+    bump_version(RecipeIngredientIndex.version_name)
+    response = client.get(
+        WHAT_TO_COOK_URL, {'ingredients': ingredients[1].id, **params}
+    )
+    assert response.status_code == 200
+    assert response.data['count'] == 1
+    assert [recipe['id'] for recipe in response.data['results']] == [
+        second.id
+    ]
+    assert response.data['results'][0]['coverage'] == 0.5
+
+
+@pytest.fixture
+def shared_index():
+    bump_version(RecipeIngredientIndex.version_name)
+    return recipe_ingredient_index
+
+
+@pytest.mark.django_db(transaction=True)
+def test_ingredient_delete_updates_index(
+    shared_index, ingredients, make_recipes
+):
+    first, second = make_recipes(2)
+    shared_index.search({ingredients[0].id})
+    ingredients[1].delete()
+    assert shared_index.search({ingredients[0].id}) == [
+        (second.id, 0, 1.0),
+        (first.id, 0, 1.0),
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_ingredient_recipe_save_updates_index(
+    shared_index, ingredients, make_recipes
+):
+    recipe = make_recipes(1)[0]
+    shared_index.search({ingredients[0].id})
+    IngredientRecipe.objects.create(
+        recipe=recipe, ingredient=ingredients[4], amount=1
+    )
+    assert shared_index.search({ingredients[0].id}) == [(recipe.id, 1, 0.5)]
@@ -0,0 +1,31 @@
+import pytest
+
+from api.caching import bump_version
+from api.indexes import IngredientIndex
+from recipes.models import Ingredient
+
+
+@pytest.fixture
+def index():
+    return IngredientIndex()
+
+
+def test_search_by_prefix_and_token(index, db):
+    Ingredient.objects.create(name='Соль морская', measurement_unit='г')
+    Ingredient.objects.create(name='Морковь', measurement_unit='г')
+    assert [item['name'] for item in index.search('мор')] == [
+        'Морковь', 'Соль морская'
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_index_follows_ingredient_version(index, django_assert_num_queries):
+    Ingredient.objects.create(name='Соль', measurement_unit='г')
+    assert len(index.search('соль')) == 1
+    with django_assert_num_queries(0):
+        assert len(index.search('соль')) == 1
+    Ingredient.objects.create(name='Соль йодированная', measurement_unit='г')
+    assert len(index.search('соль')) == 2
+    Ingredient.objects.filter(name='Соль').update(name='Сахар')
+    bump_version(IngredientIndex.version_name)
+    assert len(index.search('соль')) == 1
@@ -0,0 +1,47 @@
+import os
+import time
+
+from api import jobs
+
+OLD = time.time() - 24 * 60 * 60
+
+
+def make_job_file(root, user_id, name, mtime=None):
+    directory = root / str(user_id)
+    directory.mkdir(exist_ok=True)
+    path = directory / name
+    path.write_bytes(b'')
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+    return path
+
+
+def test_remove_expired_jobs_cleans_every_user(settings, tmp_path):
+    settings.PDF_JOB_ROOT = str(tmp_path)
+    expired = [
+        make_job_file(tmp_path, 1, 'a.pdf', OLD),
+        make_job_file(tmp_path, 2, 'b.failed', OLD),
+        make_job_file(tmp_path, 3, 'c.pending', OLD),
+    ]
+    fresh = make_job_file(tmp_path, 2, 'd.pdf')
+    jobs.remove_expired_jobs()
+    assert not any(path.exists() for path in expired)
+    assert fresh.exists()
+
+
+def test_remove_expired_jobs_tolerates_concurrent_cleanup(
+    settings, tmp_path, monkeypatch
+):
+    settings.PDF_JOB_ROOT = str(tmp_path)
+    path = make_job_file(tmp_path, 1, 'a.pdf', OLD)
+    remove = os.remove
+
+    def remove_twice(name):
+        remove(name)
+        remove(name)
+
+    monkeypatch.setattr(jobs.os, 'remove', remove_twice)
+    jobs.remove_expired_jobs()
+    assert not path.exists()
+    settings.PDF_JOB_ROOT = str(tmp_path / 'missing')
+    jobs.remove_expired_jobs()
@@ -0,0 +1,38 @@
+import pytest
+
+RECIPES_URL = '/api/recipes/'
+
+
+def get_page(client, **params):
+    response = client.get(RECIPES_URL, params)
+    assert response.status_code == 200
+    return response['X-Cache'], response.json()['results']
+
+
+@pytest.mark.django_db(transaction=True)
+def test_recipe_change_invalidates_only_its_pages(client, user, make_recipes):
+    recipe = make_recipes(1)[0]
+    for params in ({}, {'tags': 'breakfast'}, {'tags': 'dinner'},
+                   {'author': user.id}):
+        assert get_page(client, **params)[0] == 'MISS'
+        assert get_page(client, **params)[0] == 'HIT'
+    recipe.name = 'Новое название'
+    recipe.save()
+    assert get_page(client)[0] == 'MISS'
+    assert get_page(client, tags='breakfast')[0] == 'MISS'
+    assert get_page(client, tags='dinner')[0] == 'HIT'
+    assert get_page(client, author=user.id)[0] == 'HIT'
+
+
+@pytest.mark.django_db(transaction=True)
+def test_profile_change_invalidates_author_pages(client, author,
+                                                 make_recipes):
+    make_recipes(1)
+    for params in ({}, {'tags': 'breakfast'}, {'author': author.id}):
+        get_page(client, **params)
+    author.first_name = 'Переименован'
+    author.save()
+    for params in ({}, {'tags': 'breakfast'}, {'author': author.id}):
+        status, results = get_page(client, **params)
+        assert status == 'MISS'
+        assert results[0]['author']['first_name'] == 'Переименован'
@@ -0,0 +1,75 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from api.caching import count_version_name, get_version
+from recipes.models import Recipe
+
+RECIPES_URL = '/api/recipes/'
+PAGE_SIZE = 6
+
+
+def count_list_queries(client):
+    cache.clear()
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(RECIPES_URL, {'limit': PAGE_SIZE * 2})
+    assert response.status_code == 200
+    return len(context.captured_queries)
+
+
+@pytest.mark.parametrize('client_name', ('client', 'user_client'))
+def test_recipe_list_queries_do_not_grow_with_page(
+    request, client_name, user, make_recipes
+):
+    client = request.getfixturevalue(client_name)
+    make_recipes(PAGE_SIZE, user=user)
+    small_page = count_list_queries(client)
+    make_recipes(PAGE_SIZE, user=user)
+    assert count_list_queries(client) == small_page
+
+
+def test_recipe_list_flags(user_client, user, make_recipes):
+    make_recipes(2)
+    favorite = make_recipes(1, user=user)[0]
+    results = user_client.get(RECIPES_URL).json()['results']
+    flags = {
+        recipe['id']: (recipe['is_favorited'], recipe['is_in_shopping_cart'])
+        for recipe in results
+    }
+    assert flags.pop(favorite.id) == (True, True)
+    assert set(flags.values()) == {(False, False)}
+
+
+@pytest.mark.django_db(transaction=True)
+def test_count_version_is_bumped_after_commit(client, make_recipes):
+    name = count_version_name(Recipe)
+    assert client.get(RECIPES_URL).json()['count'] == 0
+    with transaction.atomic():
+        version = get_version(name)
+        make_recipes(1)
+        assert get_version(name) == version
+    assert get_version(name) != version
+    assert client.get(RECIPES_URL).json()['count'] == 1
+
+
+def test_count_is_shared_between_users(user_client, author, make_recipes):
+    make_recipes(PAGE_SIZE + 1)
+    with CaptureQueriesContext(connection) as context:
+        assert user_client.get(RECIPES_URL).json()['count'] == PAGE_SIZE + 1
+    [count_sql] = [
+        query['sql'] for query in context.captured_queries
+        if 'COUNT(' in query['sql']
+    ]
+    assert 'EXISTS' not in count_sql
+    author_client = APIClient()
+    author_client.force_authenticate(author)
+    with CaptureQueriesContext(connection) as context:
+        assert author_client.get(RECIPES_URL).json()['count'] == (
+            PAGE_SIZE + 1
+        )
+    assert not [
+        query for query in context.captured_queries
+        if 'COUNT(' in query['sql']
+    ]
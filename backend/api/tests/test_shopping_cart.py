@@ -0,0 +1,53 @@
+import pytest
+from rest_framework.test import APIClient
+
+DOWNLOAD_URL = '/api/recipes/download_shopping_cart/'
+
+
+@pytest.mark.django_db(transaction=True)
+def test_cached_shopping_list_follows_recipe_update(
+    user_client, user, author, ingredients, tags, make_recipes
+):
+    recipe = make_recipes(1, user=user)[0]
+    first = user_client.get(DOWNLOAD_URL).getvalue()
+    assert user_client.get(DOWNLOAD_URL).getvalue() == first
+    author_client = APIClient()
+    author_client.force_authenticate(author)
+    response = author_client.patch(f'/api/recipes/{recipe.id}/', {
+        'tags': [tags[0].id],
+        'ingredients': [{'id': ingredients[4].id, 'amount': 7}],
+        'name': recipe.name,
+        'text': recipe.text,
+        'cooking_time': recipe.cooking_time,
+    }, format='json')
+    assert response.status_code == 200
+    assert user_client.get(DOWNLOAD_URL).getvalue() != first
+    text = user_client.get(
+        DOWNLOAD_URL, {'format': 'txt'}
+    ).getvalue().decode()
+    assert f'{ingredients[4].name} - 7' in text
+
+
+@pytest.mark.django_db(transaction=True)
+def test_cached_shopping_list_follows_ingredient_amount_change(
+    user_client, user, make_recipes
+):
+    recipe = make_recipes(1, user=user)[0]
+    response = user_client.get(DOWNLOAD_URL)
+    first = response.getvalue()
+    item = recipe.ingredient_recipe.get()
+    item.amount = 42
+    item.save()
+    response = user_client.get(
+        DOWNLOAD_URL, HTTP_IF_NONE_MATCH=response['ETag']
+    )
+    assert response.status_code == 200
+    assert response.getvalue() != first
+
+
+@pytest.mark.parametrize('params', [{}, {'format': 'pdf'}, {'format': 'csv'}])
+def test_shopping_list_errors_are_json(client, db, params):
+    response = client.get(DOWNLOAD_URL, params)
+    assert response.status_code == 401
+    assert response['Content-Type'] == 'application/json'
+    assert 'detail' in response.json()
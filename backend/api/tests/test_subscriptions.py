@@ -0,0 +1,23 @@
+import pytest
+
+from users.models import Follow
+
+URL = '/api/users/subscriptions/'
+
+
+@pytest.mark.parametrize('recipes_limit, expected', [
+    ('0', 0),
+    ('2', 2),
+    (None, 3),
+])
+def test_recipes_limit(
+    user, author, user_client, make_recipes, recipes_limit, expected
+):
+    make_recipes(3)
+    Follow.objects.create(user=user, author=author)
+    params = {} if recipes_limit is None else {'recipes_limit': recipes_limit}
+    response = user_client.get(URL, params)
+    assert response.status_code == 200
+    [subscription] = response.data['results']
+    assert len(subscription['recipes']) == expected
+    assert subscription['recipes_count'] == 3
@@ -0,0 +1,27 @@
+from django.core.files.uploadedfile import SimpleUploadedFile
+from rest_framework.test import APIClient
+
+from api.uploads import MULTIPART_OVERHEAD
+
+MAX_SIZE = 1000
+
+
+def test_streamed_image_over_limit_is_rejected(
+    settings, author, make_recipes
+):
+    settings.RECIPE_IMAGE_MAX_SIZE = MAX_SIZE
+    recipe = make_recipes(1)[0]
+    client = APIClient()
+    client.force_authenticate(author)
+    # small enough to pass the Content-Length check, too big for the limit
+    image = SimpleUploadedFile(
+        'photo.png', b'x' * (MULTIPART_OVERHEAD + MAX_SIZE // 2)
+    )
+    response = client.put(
+        f'/api/recipes/{recipe.id}/image/', {'image': image},
+        format='multipart'
+    )
+    assert response.status_code == 400
+    assert response.json() == {'image': [
+        settings.WRONG_IMAGE_SIZE.format(0)
+    ]}
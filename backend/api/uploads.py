@@ -0,0 +1,71 @@
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.uploadhandler import (
+    SkipFile, TemporaryFileUploadHandler
+)
+from drf_extra_fields.fields import Base64ImageField
+from PIL import Image
+from rest_framework import serializers
+
+BASE64_HEADER_LENGTH = 64
+MULTIPART_OVERHEAD = 4 * 2 ** 10
+
+
+def is_too_large(size):
+    return size > settings.RECIPE_IMAGE_MAX_SIZE
+
+
+def is_encoded_too_large(length):
+    return is_too_large(3 * (length - BASE64_HEADER_LENGTH) // 4)
+
+
+def is_request_too_large(length):
+    return is_too_large(length - MULTIPART_OVERHEAD)
+
+
+def size_error():
+    return ValidationError(settings.WRONG_IMAGE_SIZE.format(
+        settings.RECIPE_IMAGE_MAX_SIZE // 2 ** 20
+    ))
+
+
+def pixels_error():
+    return ValidationError(settings.WRONG_IMAGE_PIXELS.format(
+        settings.RECIPE_IMAGE_MAX_PIXELS // 10 ** 6
+    ))
+
+
+class ImageLimitsMixin:
+    def to_internal_value(self, data):
+        try:
+            file = super().to_internal_value(data)
+        except Image.DecompressionBombError:
+            raise pixels_error()
+        if is_too_large(file.size):
+            raise size_error()
+        width, height = file.image.size
+        if width * height > settings.RECIPE_IMAGE_MAX_PIXELS:
+            raise pixels_error()
+        return file
+
+
+class LimitedBase64ImageField(ImageLimitsMixin, Base64ImageField):
+    def to_internal_value(self, data):
+        if isinstance(data, str) and is_encoded_too_large(len(data)):
+            raise size_error()
+        return super().to_internal_value(data)
+
+
+class LimitedImageField(ImageLimitsMixin, serializers.ImageField):
+    pass
+
+
+class LimitedTemporaryFileUploadHandler(TemporaryFileUploadHandler):
+    too_large = False
+
+    def receive_data_chunk(self, raw_data, start):
+        if is_too_large(start + len(raw_data)):
+            self.too_large = True
+            self.file.close()
+            raise SkipFile
+        return super().receive_data_chunk(raw_data, start)
@@ -1,50 +1,57 @@
-from django.db.models import Sum
-from django.http import HttpResponse
-from reportlab.lib.pagesizes import A4
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-from reportlab.pdfgen import canvas
-
-from recipes.models import IngredientRecipe
-
-
-def canvas_method(dictionary):
-    response = HttpResponse(content_type='application/pdf')
-    response['Content-Disposition'] = 'attachment; filename = "cart.pdf"'
-    begin_position_x, begin_position_y = 40, 650
-    sheet = canvas.Canvas(response, pagesize=A4)
-    pdfmetrics.registerFont(
-        TTFont('FreeSans', 'data/FreeSans.ttf')
-    )
-    sheet.setFont('FreeSans', 36)
-    sheet.setTitle('Список покупок')
-    sheet.drawString(
-        begin_position_x,
-        begin_position_y + 40,
-        'Список покупок: '
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Sum, Window
+from django.db.models.functions import RowNumber
+from django.http import (
+    HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+)
+
+from api.caching import (
+    PAYLOAD_KEY, bump_version, bump_versions_on_commit, get_version,
+    is_not_modified, set_validators
+)
+from api.exports import EXPORTS
+from api.pdf import render_shopping_list
+from recipes.models import IngredientRecipe, Recipe, ShoppingCart
+from users.models import Follow
+
+SUBSCRIPTIONS_ATTR = '_subscribed_author_ids'
+CART_VERSION = 'cart:{}'
+RECIPES_VERSION = 'recipes'
+RECIPES_AUTHOR_VERSION = 'recipes:author:{}'
+RECIPES_TAG_VERSION = 'recipes:tag:{}'
+
+
+def cart_version_name(user_id):
+    return CART_VERSION.format(user_id)
+
+
+def bump_cart_versions(recipe_ids):
+    def bump():
+        for user_id in set(
+            ShoppingCart.objects.filter(
+                recipe__in=recipe_ids
+            ).values_list('user_id', flat=True)
+        ):
+            bump_version(cart_version_name(user_id))
+
+    transaction.on_commit(bump)
+
+
+def bump_recipe_versions(author_ids=(), tag_ids=()):
+    bump_versions_on_commit(
+        RECIPES_VERSION,
+        *{RECIPES_AUTHOR_VERSION.format(pk) for pk in author_ids},
+        *{RECIPES_TAG_VERSION.format(pk) for pk in tag_ids}
     )
-    sheet.setFont('FreeSans', 20)
-    for number, item in enumerate(dictionary, start=1):
-        if begin_position_y < 100:
-            begin_position_y = 700
-            sheet.showPage()
-            sheet.setFont('FreeSans', 24)
-        sheet.drawString(
-            begin_position_x,
-            begin_position_y,
-            f'{number}.  {item["ingredient__name"]} - '
-            f'{item["ingredient_amount"]}'
-            f' {item["ingredient__measurement_unit"]}'
-        )
-        begin_position_y -= 30
-    sheet.showPage()
-    sheet.save()
-    return response
 
 
-def download_cart(request):
-    result = IngredientRecipe.objects.filter(
-        recipe__shopping_cart__user=request.user
+def get_cart_items(user):
+    return IngredientRecipe.objects.filter(
+        recipe__shopping_cart__user=user
     ).values(
         'ingredient__name',
         'ingredient__measurement_unit'
@@ -53,4 +60,79 @@ def download_cart(request):
     ).annotate(
         ingredient_amount=Sum('amount')
     )
-    return canvas_method(result)
+
+
+def download_cart(request):
+    export_format = request.accepted_renderer.format
+    cart_version = get_version(cart_version_name(request.user.id))
+    ingredients_version = get_version('ingredients')
+    etag = (
+        f'"cart-{request.user.id}-{cart_version}-{ingredients_version}'
+        f'-{export_format}"'
+    )
+    last_modified = max(cart_version, ingredients_version) // 10 ** 9
+    if is_not_modified(request, etag, last_modified):
+        response = HttpResponseNotModified()
+    elif export_format in EXPORTS:
+        iterate, content_type = EXPORTS[export_format]
+        response = StreamingHttpResponse(
+            iterate(get_cart_items(request.user).iterator()),
+            content_type=content_type
+        )
+    else:
+        key = PAYLOAD_KEY.format('cart', etag.strip('"'))
+        document = cache.get(key)
+        if document is None:
+            document = render_shopping_list(get_cart_items(request.user))
+            cache.set(key, document, settings.CART_CACHE_TIMEOUT)
+        response = HttpResponse(document, content_type='application/pdf')
+    response['Content-Disposition'] = (
+        f'attachment; filename = "cart.{export_format}"'
+    )
+    set_validators(response, etag, last_modified, 'private, no-cache')
+    return response
+
+
+def attach_author_recipes(follows, recipes_limit=None):
+    recipes = Recipe.objects.filter(
+        author__in={follow.author_id for follow in follows}
+    ).only('id', 'name', 'image', 'cooking_time', 'author')
+    if recipes_limit is not None:
+        ranked = recipes.annotate(
+            recipe_rank=Window(
+                expression=RowNumber(),
+                partition_by=[F('author')],
+                order_by=F('id').desc()
+            )
+        ).order_by().values(
+            'id', 'name', 'image', 'cooking_time', 'author', 'recipe_rank'
+        )
+        sql, params = ranked.query.sql_with_params()
+        recipes = Recipe.objects.raw(
+            f'SELECT * FROM ({sql}) ranked '
+            'WHERE recipe_rank <= %s ORDER BY recipe_rank',
+            (*params, recipes_limit)
+        )
+    else:
+        recipes = recipes.order_by('-id')
+    author_recipes = defaultdict(list)
+    for recipe in recipes:
+        author_recipes[recipe.author_id].append(recipe)
+    for follow in follows:
+        follow.author_recipes = author_recipes[follow.author_id]
+
+
+def get_subscribed_author_ids(request):
+    author_ids = getattr(request, SUBSCRIPTIONS_ATTR, None)
+    if author_ids is None:
+        author_ids = set(
+            Follow.objects.filter(
+                user=request.user
+            ).values_list('author_id', flat=True)
+        )
+        setattr(request, SUBSCRIPTIONS_ATTR, author_ids)
+    return author_ids
+
+
+def reset_subscribed_author_ids(request):
+    setattr(request, SUBSCRIPTIONS_ATTR, None)
@@ -1,27 +1,52 @@
+from django.conf import settings
+from django.db.models import BooleanField, Exists, OuterRef, Value
+from django.http import FileResponse, Http404
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from djoser.views import UserViewSet
 from rest_framework import status
 from rest_framework.decorators import action, permission_classes
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import (
     AllowAny, IsAuthenticated, IsAuthenticatedOrReadOnly
 )
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet, ReadOnlyModelViewSet
 
-from api.filters import IngredientSearchFilter, RecipeFilter
+from api.caching import AnonymousListCacheMixin, PrerenderedListMixin
+from api.filters import RecipeFilter, tag_slugs
+from api.indexes import ingredient_index, recipe_ingredient_index
+from api.jobs import PENDING, READY, get_job_status, submit_job
+from api.pagination import (
+    CursorPaginationMixin, FollowCursorPagination, PageLimitPagination,
+    RecipeCursorPagination
+)
+from api.renderers import (
+    CSVRenderer, PDFRenderer, PlainTextRenderer, ShoppingListRenderer
+)
 from api.serializers import (
     CustomUserSerializer, FavoriteSerializer, FollowListSerializer,
-    FollowSerializer, IngredientSerializer, RecipeListSerializer,
-    RecipeSerializer, ShoppingCartSerializer, TagSerializer
+    FollowSerializer, IngredientSerializer, RecipeCoverageSerializer,
+    RecipeImageSerializer, RecipeListSerializer, RecipeSerializer,
+    ShoppingCartSerializer, TagSerializer
+)
+from api.uploads import (
+    LimitedTemporaryFileUploadHandler, is_request_too_large, size_error
+)
+from api.utils import (
+    RECIPES_AUTHOR_VERSION, RECIPES_TAG_VERSION, RECIPES_VERSION,
+    attach_author_recipes, download_cart, get_cart_items,
+    reset_subscribed_author_ids
 )
-from api.utils import download_cart
 from recipes.models import Favorite, Ingredient, Recipe, ShoppingCart, Tag
 from users.models import Follow, User
 
 
-class CustomUserViewSet(UserViewSet):
+class CustomUserViewSet(CursorPaginationMixin, UserViewSet):
     queryset = User.objects.all()
+    cursor_pagination_class = FollowCursorPagination
 
     @action(
         detail=True,
@@ -42,6 +67,7 @@ class CustomUserViewSet(UserViewSet):
             )
             serializer.is_valid(raise_exception=True)
             serializer.save()
+            reset_subscribed_author_ids(request)
             return Response(
                 serializer.data,
                 status=status.HTTP_201_CREATED
@@ -51,6 +77,7 @@ class CustomUserViewSet(UserViewSet):
             user=request.user,
             author=author
         ).delete()
+        reset_subscribed_author_ids(request)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
     @action(
@@ -58,11 +85,21 @@ class CustomUserViewSet(UserViewSet):
         permission_classes=(IsAuthenticated, )
     )
     def subscriptions(self, request):
+        follows = self.paginate_queryset(
+            Follow.objects.filter(
+                user=request.user
+            ).select_related(
+                'author'
+            )
+        )
+        recipes_limit = request.query_params.get('recipes_limit')
+        attach_author_recipes(
+            follows,
+            int(recipes_limit) if recipes_limit else None
+        )
         return self.get_paginated_response(
             FollowListSerializer(
-                self.paginate_queryset(
-                    Follow.objects.filter(user=request.user)
-                ),
+                follows,
                 many=True,
                 context={'request': request}
             ).data
@@ -83,26 +120,78 @@ class CustomUserViewSet(UserViewSet):
 
 
 @permission_classes([AllowAny, ])
-class TagViewSet(ReadOnlyModelViewSet):
+class TagViewSet(PrerenderedListMixin, ReadOnlyModelViewSet):
     queryset = Tag.objects.all()
     serializer_class = TagSerializer
     pagination_class = None
+    cache_name = 'tags'
 
 
 @permission_classes([AllowAny, ])
-class IngredientViewSet(ReadOnlyModelViewSet):
+class IngredientViewSet(PrerenderedListMixin, ReadOnlyModelViewSet):
     queryset = Ingredient.objects.all()
     serializer_class = IngredientSerializer
-    filter_backends = (IngredientSearchFilter, )
-    search_fields = ('^name', )
     pagination_class = None
+    cache_name = 'ingredients'
+
+    def list(self, request, *args, **kwargs):
+        name = request.query_params.get('name')
+        if name:
+            return Response(ingredient_index.search(name))
+        return super().list(request, *args, **kwargs)
 
 
 @permission_classes([IsAuthenticatedOrReadOnly, ])
-class RecipeViewSet(ModelViewSet):
-    queryset = Recipe.objects.all()
+class RecipeViewSet(
+    AnonymousListCacheMixin, CursorPaginationMixin, ModelViewSet
+):
+    queryset = Recipe.objects.with_related()
     filterset_class = RecipeFilter
     filter_backends = (DjangoFilterBackend, )
+    cursor_pagination_class = RecipeCursorPagination
+    list_cache_prefix = 'recipes'
+
+    def get_list_version_names(self):
+        params = self.request.query_params
+        names = ['tags', 'ingredients']
+        tags = params.getlist('tags')
+        if params.get('author'):
+            names.append(RECIPES_AUTHOR_VERSION.format(params['author']))
+        elif tags and not params.get('search'):
+            ids = tag_slugs.get_ids()
+            names += [
+                RECIPES_TAG_VERSION.format(ids.get(slug)) for slug in tags
+            ]
+        else:
+            names.append(RECIPES_VERSION)
+        return names
+
+    def handle_exception(self, exc):
+        if isinstance(
+            getattr(self.request, 'accepted_renderer', None),
+            ShoppingListRenderer
+        ):
+            self.request.accepted_renderer = JSONRenderer()
+            self.request.accepted_media_type = JSONRenderer.media_type
+        return super().handle_exception(exc)
+
+    def get_queryset(self):
+        user = self.request.user
+        if user.is_anonymous:
+            return self.queryset.annotate(
+                is_favorited=Value(False, output_field=BooleanField()),
+                is_in_shopping_cart=Value(False, output_field=BooleanField())
+            )
+        return self.queryset.annotate(
+            is_favorited=Exists(Favorite.objects.filter(
+                user=user,
+                recipe=OuterRef('pk')
+            )),
+            is_in_shopping_cart=Exists(ShoppingCart.objects.filter(
+                user=user,
+                recipe=OuterRef('pk')
+            ))
+        )
 
     def get_serializer_class(self):
         if self.request.method == 'GET':
@@ -134,6 +223,74 @@ class RecipeViewSet(ModelViewSet):
         ).delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
+    @action(
+        detail=False,
+        methods=('GET',),
+        url_path='what_to_cook'
+    )
+    def what_to_cook(self, request):
+        try:
+            ingredient_ids = {
+                int(value)
+                for values in request.query_params.getlist('ingredients')
+                for value in values.split(',')
+                if value
+            }
+        except ValueError:
+            raise ValidationError({
+                'ingredients': settings.WRONG_INGREDIENT_IDS
+            })
+        if not ingredient_ids:
+            raise ValidationError({
+                'ingredients': settings.WRONG_INGREDIENT_CHOOSE
+            })
+        self._paginator = PageLimitPagination()
+        page = self.paginate_queryset(
+            recipe_ingredient_index.search(ingredient_ids)
+        )
+        recipes = self.get_queryset().in_bulk(
+            [recipe_id for recipe_id, _, _ in page]
+        )
+        results = []
+        for recipe_id, missing, coverage in page:
+            recipe = recipes.get(recipe_id)
+            if recipe is None:
+                continue
+            recipe.missing_ingredients = missing
+            recipe.coverage = round(coverage, 3)
+            results.append(recipe)
+        return self.get_paginated_response(RecipeCoverageSerializer(
+            results,
+            many=True,
+            context=self.get_serializer_context()
+        ).data)
+
+    @action(
+        detail=True,
+        methods=('PUT',),
+        permission_classes=(IsAuthenticated,),
+        parser_classes=(MultiPartParser,)
+    )
+    def image(self, request, pk):
+        recipe = get_object_or_404(Recipe, id=pk)
+        if recipe.author != request.user:
+            raise PermissionDenied()
+        if is_request_too_large(int(request.META.get('CONTENT_LENGTH') or 0)):
+            raise ValidationError({'image': size_error().messages})
+        handler = LimitedTemporaryFileUploadHandler(request._request)
+        request._request.upload_handlers = [handler]
+        data = request.data
+        if handler.too_large:
+            raise ValidationError({'image': size_error().messages})
+        serializer = RecipeImageSerializer(
+            recipe,
+            data=data,
+            context=self.get_serializer_context()
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data)
+
     @action(
         detail=True,
         methods=('POST',),
@@ -176,6 +333,47 @@ class RecipeViewSet(ModelViewSet):
     @action(
         detail=False,
         methods=('GET',),
-        permission_classes=(IsAuthenticated,))
+        permission_classes=(IsAuthenticated,),
+        renderer_classes=(
+            PDFRenderer, PlainTextRenderer, CSVRenderer, JSONRenderer
+        ))
     def download_shopping_cart(self, request):
         return download_cart(request)
+
+    @action(
+        detail=False,
+        methods=('POST',),
+        permission_classes=(IsAuthenticated,),
+        url_path='download_shopping_cart/jobs')
+    def download_shopping_cart_jobs(self, request):
+        job_id = submit_job(
+            request.user.id,
+            list(get_cart_items(request.user))
+        )
+        if job_id is None:
+            return Response(
+                {'detail': settings.PDF_JOB_BUSY},
+                status=status.HTTP_429_TOO_MANY_REQUESTS
+            )
+        return Response(
+            {'id': job_id, 'status': PENDING},
+            status=status.HTTP_202_ACCEPTED
+        )
+
+    @action(
+        detail=False,
+        methods=('GET',),
+        permission_classes=(IsAuthenticated,),
+        url_path=r'download_shopping_cart/jobs/(?P<job_id>[0-9a-f]{32})')
+    def download_shopping_cart_job(self, request, job_id):
+        job_status, path = get_job_status(request.user.id, job_id)
+        if job_status is None:
+            raise Http404
+        if job_status == READY:
+            return FileResponse(
+                open(path, 'rb'),
+                as_attachment=True,
+                filename='cart.pdf',
+                content_type='application/pdf'
+            )
+        return Response({'id': job_id, 'status': job_status})
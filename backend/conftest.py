@@ -0,0 +1,95 @@
+import pytest
+from django.core.cache import cache
+from rest_framework.test import APIClient
+
+from recipes.models import (
+    Favorite, Ingredient, IngredientRecipe, Recipe, ShoppingCart, Tag
+)
+from users.models import User
+
+
+@pytest.fixture(autouse=True)
+def isolated_storage(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path / 'media')
+    settings.CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+    cache.clear()
+
+
+@pytest.fixture
+def user(db):
+    return User.objects.create_user(
+        username='user',
+        email='user@example.com',
+        password='password',
+        first_name='Имя',
+        last_name='Фамилия'
+    )
+
+
+@pytest.fixture
+def author(db):
+    return User.objects.create_user(
+        username='author',
+        email='author@example.com',
+        password='password',
+        first_name='Автор',
+        last_name='Рецептов'
+    )
+
+
+@pytest.fixture
+def tags(db):
+    return [
+        Tag.objects.create(name=slug, color='#000000', slug=slug)
+        for slug in ('breakfast', 'lunch', 'dinner')
+    ]
+
+
+@pytest.fixture
+def ingredients(db):
+    return [
+        Ingredient.objects.create(name=f'ингредиент {number}',
+                                  measurement_unit='г')
+        for number in range(5)
+    ]
+
+
+@pytest.fixture
+def make_recipes(author, tags, ingredients):
+    def make(count, user=None):
+        recipes = []
+        for number in range(count):
+            recipe = Recipe.objects.create(
+                author=author,
+                name=f'Рецепт {number}',
+                text='Описание',
+                cooking_time=10
+            )
+            recipe.tags.set(tags[:1 + number % len(tags)])
+            IngredientRecipe.objects.bulk_create(
+                IngredientRecipe(recipe=recipe, ingredient=ingredient,
+                                 amount=number + 1)
+                for ingredient in ingredients[:1 + number % 3]
+            )
+            if user is not None:
+                Favorite.objects.create(user=user, recipe=recipe)
+                ShoppingCart.objects.create(user=user, recipe=recipe)
+            recipes.append(recipe)
+        return recipes
+    return make
+
+
+@pytest.fixture
+def client():
+    return APIClient()
+
+
+@pytest.fixture
+def user_client(user):
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
@@ -87,6 +87,22 @@ else:
         }
     }
 
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND',
+            default='django.core.cache.backends.filebased.FileBasedCache'
+        ),
+        'LOCATION': os.getenv(
+            'CACHE_LOCATION',
+            default=os.path.join(BASE_DIR, 'cache')
+        ),
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.getenv('CACHE_MAX_ENTRIES', default=50000)),
+        },
+    }
+}
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -132,7 +148,7 @@ REST_FRAMEWORK = {
         'rest_framework.authentication.TokenAuthentication',
     ],
 
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.PageLimitPagination',
     'PAGE_SIZE': 6,
 }
 
@@ -151,13 +167,46 @@ DJOSER = {
 
 
 EMAIL_MAX_LENGTH = 254
+MAX_PAGE_SIZE = 100
+COUNT_CACHE_TIMEOUT = 60 * 60
+COUNT_ESTIMATE_THRESHOLD = 100000
 NAME_MAX_LENGTH = 200
 SLUG_MAX_LENGTH = 200
 MEASUREMENT_UNIT_MAX_LENGTH = 200
 TEXT_MAX_LENGTH = 150
 COLOR_MAX_LENGTH = 7
+INGREDIENT_SEARCH_LIMIT = 20
+PAYLOAD_CACHE_TIMEOUT = 60 * 60 * 24
+CART_CACHE_TIMEOUT = 60 * 60
+LIST_CACHE_TIMEOUT = 60 * 10
+PDF_FONT_PATH = os.path.join(BASE_DIR, 'data', 'FreeSans.ttf')
+SHOPPING_LIST_TITLE = 'Список покупок'
+PDF_JOB_ROOT = os.path.join(BASE_DIR, 'jobs')
+PDF_JOB_WORKERS = 2
+PDF_JOB_QUEUE_SIZE = 20
+PDF_JOB_TTL = 60 * 60
+INGREDIENTS_DATA_PATH = os.path.join(BASE_DIR, 'data', 'ingredients.json')
+TAGS_DATA_PATH = os.path.join(BASE_DIR, 'data', 'tags.csv')
+RECIPE_IMAGE_DERIVATIVES_DIR = 'recipes/derivatives'
+RECIPE_IMAGE_SIZES = {
+    'card': (600, 400),
+    'detail': (1200, 800),
+}
+RECIPE_IMAGE_FORMAT = 'WEBP'
+RECIPE_IMAGE_QUALITY = 80
+RECIPE_IMAGE_MAX_SIZE = 10 * 2 ** 20
+RECIPE_IMAGE_MAX_PIXELS = 40 * 10 ** 6
+MEDIA_GC_MIN_AGE = 60
 LOAD_DATA_START = 'Началась загрузка ингредиентов и тэгов в базу данных'
 LOAD_DATA_SUCCESS = 'Ингредиенты и тэги добавлены в базу данных'
+LOAD_DATA_PROGRESS = 'Обработано строк: {}'
+LOAD_DATA_RESULT = '{}: добавлено {}, пропущено {}'
+LOAD_DATA_WRONG_FORMAT = 'Ожидается JSON-массив объектов'
+RECOUNT_RESULT = '{}: пересчитано поле «{}»'
+RECOUNT_SUCCESS = 'Счётчики пересчитаны'
+BUILD_IMAGES_RESULT = 'Создано: {}, пропущено: {}, ошибок: {}'
+CACHE_STATS_RESULT = 'Попаданий: {}, промахов: {}, доля попаданий: {:.1%}'
+MEDIA_GC_RESULT = 'Удалено файлов: {}, оставлено: {}'
 SLUG_ERROR = (
     'Можно использовать цифры и латинские буквы. Не более 200 символов'
 )
@@ -166,11 +215,16 @@ WRONG_SYMBOLS = 'Недопустимые символы: {}'
 WRONG_COOKING_TIME = 'Время приготовления должно быть больше 0!'
 WRONG_UNIQUE_TAGS = 'Тэги должны быть уникальными!'
 WRONG_UNIQUE_INGREDIENTS = 'Ингредиенты должны быть уникальными!'
+WRONG_INGREDIENTS_NOT_FOUND = 'Ингредиенты не найдены: {}'
 WRONG_UNIQUE_RECEPIE = 'Рецепт уже находится в избранном.'
 WRONG_INGREDIENT_CHOOSE = 'Нужно выбрать хотя бы один ингредиент!'
 WRONG_TAG_CHOOSE = 'Нужно выбрать хотя бы один тэг!'
+WRONG_INGREDIENT_IDS = 'Идентификаторы ингредиентов должны быть числами!'
 WRONG_INGREDIENT_AMOUNT = 'Количество ингредиента должно быть больше нуля!'
 WRONG_RECIPE_TO_SHOPPINGCART = 'Рецепт уже добавлен в список покупок.'
 WRONG_FOLLOW = 'Подписка на автора уже осуществлена.'
 USER_NOT_EXIST = 'Такого пользователя не существует.'
 EMPTY_VALUE = '-пусто-'
+WRONG_IMAGE_SIZE = 'Размер изображения не должен превышать {} МБ!'
+WRONG_IMAGE_PIXELS = 'Изображение не должно быть больше {} мегапикселей!'
+PDF_JOB_BUSY = 'Слишком много задач на формирование списка покупок.'
@@ -1,6 +1,7 @@
 from django.conf import settings
 from django.contrib import admin
 from django.contrib.auth.models import Group
+from django.db.models import Prefetch
 
 from recipes.models import (
     Favorite, Ingredient, IngredientRecipe, Recipe, ShoppingCart, Tag
@@ -10,6 +11,7 @@ from users.models import Follow, User
 
 class RecipeIngredientsInline(admin.TabularInline):
     model = Recipe.ingredients.through
+    autocomplete_fields = ('ingredient',)
     extra = 1
     min_num = 1
 
@@ -38,13 +40,14 @@ class UserClass(admin.ModelAdmin):
         'username',
         'email',
     )
+    show_full_result_count = False
     empty_value_display = settings.EMPTY_VALUE
 
     def get_recipes(self, obj):
-        return obj.recipes.count()
+        return obj.recipes_count
 
     def get_followers(self, obj):
-        return obj.following.count()
+        return obj.followers_count
 
     get_recipes.short_description = 'Рецепты'
     get_followers.short_description = 'Подписчики'
@@ -57,10 +60,7 @@ class IngredientClass(admin.ModelAdmin):
         'name',
         'measurement_unit',
     )
-    list_filter = (
-        'name',
-        'measurement_unit',
-    )
+    list_filter = ('measurement_unit',)
     list_editable = (
         'name',
         'measurement_unit',
@@ -100,20 +100,26 @@ class RecipeClass(admin.ModelAdmin):
         'author',
         'get_favorite',
     )
-    list_filter = (
-        'author',
-        'name',
-        'tags',
-    )
+    list_filter = ('tags',)
+    list_select_related = ('author',)
+    autocomplete_fields = ('author',)
     ordering = ('-id',)
-    search_fields = ('name',)
+    search_fields = ('name', 'author__username')
+    show_full_result_count = False
     empty_value_display = settings.EMPTY_VALUE
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).prefetch_related(
+            Prefetch('ingredients', queryset=Ingredient.objects.only('name'))
+        )
+
     def get_favorite(self, obj):
-        return obj.favorite.count()
+        return obj.favorites_count
 
     def get_ingredients(self, obj):
-        return ', '.join(obj.ingredients.all().values_list('name', flat=True))
+        return ', '.join(
+            ingredient.name for ingredient in obj.ingredients.all()
+        )
 
     get_favorite.short_description = 'Избранное'
     get_ingredients.short_description = 'Ингредиенты'
@@ -127,12 +133,11 @@ class IngredientRecipeClass(admin.ModelAdmin):
         'recipe',
         'amount',
     )
-    list_filter = (
-        'ingredient',
-        'recipe',
-        'amount',
-    )
+    list_select_related = ('ingredient', 'recipe')
+    autocomplete_fields = ('ingredient', 'recipe')
+    search_fields = ('ingredient__name', 'recipe__name')
     ordering = ('-recipe',)
+    show_full_result_count = False
     empty_value_display = settings.EMPTY_VALUE
 
 
@@ -143,11 +148,11 @@ class FavoriteClass(admin.ModelAdmin):
         'user',
         'recipe',
     )
-    list_filter = (
-        'user',
-        'id',
-    )
+    list_select_related = ('user', 'recipe')
+    autocomplete_fields = ('user', 'recipe')
+    search_fields = ('user__username', 'recipe__name')
     ordering = ('-id',)
+    show_full_result_count = False
     empty_value_display = settings.EMPTY_VALUE
 
 
@@ -158,14 +163,20 @@ class ShoppingCartClass(admin.ModelAdmin):
         'user',
         'recipe',
     )
-    list_filter = ('user', 'recipe')
+    list_select_related = ('user', 'recipe')
+    autocomplete_fields = ('user', 'recipe')
+    search_fields = ('user__username', 'recipe__name')
     ordering = ('-id',)
+    show_full_result_count = False
     empty_value_display = settings.EMPTY_VALUE
 
 
 @admin.register(Follow)
 class FollowAdmin(admin.ModelAdmin):
     list_display = ('id', 'user_id', 'author_id')
+    autocomplete_fields = ('user', 'author')
+    search_fields = ('user__username', 'author__username')
+    show_full_result_count = False
 
 
 admin.site.unregister(Group)
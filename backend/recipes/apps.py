@@ -3,3 +3,17 @@ from django.apps import AppConfig
 
 class RecipesConfig(AppConfig):
     name = 'recipes'
+
+    def ready(self):
+        from django.conf import settings
+        from django.db.models.signals import post_save
+        from PIL import Image
+
+        from recipes.images import build_recipe_derivatives
+        from recipes.models import Favorite, Recipe
+        from users.counters import register_counter
+
+        Image.MAX_IMAGE_PIXELS = settings.RECIPE_IMAGE_MAX_PIXELS
+        post_save.connect(build_recipe_derivatives, sender=Recipe)
+        register_counter(Recipe, 'author', 'recipes_count')
+        register_counter(Favorite, 'recipe', 'favorites_count')
@@ -0,0 +1,77 @@
+import posixpath
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+EXTENSIONS = {'WEBP': 'webp', 'JPEG': 'jpg'}
+
+
+def get_derivative_name(name, size_name):
+    stem = posixpath.splitext(posixpath.basename(name))[0]
+    width, height = settings.RECIPE_IMAGE_SIZES[size_name]
+    return posixpath.join(
+        settings.RECIPE_IMAGE_DERIVATIVES_DIR,
+        f'{stem}_{width}x{height}q{settings.RECIPE_IMAGE_QUALITY}.'
+        f'{EXTENSIONS[settings.RECIPE_IMAGE_FORMAT]}'
+    )
+
+
+def get_derivative_names(name):
+    return {
+        size_name: get_derivative_name(name, size_name)
+        for size_name in settings.RECIPE_IMAGE_SIZES
+    }
+
+
+def get_derivative_urls(image):
+    return {
+        size_name: default_storage.url(name)
+        for size_name, name in get_derivative_names(image.name).items()
+    }
+
+
+def open_source(image):
+    with image.open('rb') as file:
+        source = ImageOps.exif_transpose(Image.open(file))
+        source.load()
+    if settings.RECIPE_IMAGE_FORMAT == 'WEBP' and source.mode in (
+        'RGBA', 'LA', 'P'
+    ):
+        return source.convert('RGBA')
+    return source.convert('RGB')
+
+
+def build_derivatives(image, force=False):
+    names = get_derivative_names(image.name)
+    if not force and all(
+        default_storage.exists(name) for name in names.values()
+    ):
+        return False
+    source = open_source(image)
+    for size_name, size in settings.RECIPE_IMAGE_SIZES.items():
+        derivative = source.copy()
+        derivative.thumbnail(size, Image.LANCZOS)
+        buffer = BytesIO()
+        derivative.save(
+            buffer,
+            format=settings.RECIPE_IMAGE_FORMAT,
+            quality=settings.RECIPE_IMAGE_QUALITY
+        )
+        if default_storage.exists(names[size_name]):
+            default_storage.delete(names[size_name])
+        default_storage.save(
+            names[size_name], ContentFile(buffer.getvalue())
+        )
+    return True
+
+
+def build_recipe_derivatives(sender, instance, raw=False, **kwargs):
+    if raw or not instance.image:
+        return
+    try:
+        build_derivatives(instance.image)
+    except OSError:
+        pass
@@ -0,0 +1,53 @@
+import os
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from recipes.images import build_derivatives
+from recipes.models import Recipe
+
+BUILT, SKIPPED, FAILED = 'built', 'skipped', 'failed'
+
+
+def build(name, force):
+    try:
+        if build_derivatives(Recipe(image=name).image, force=force):
+            return BUILT
+    except OSError:
+        return FAILED
+    return SKIPPED
+
+
+class Command(BaseCommand):
+    help = 'Создаёт уменьшенные копии изображений рецептов'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count(),
+            help='Количество параллельных потоков'
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Пересоздать уже существующие копии'
+        )
+
+    def handle(self, *args, **options):
+        names = Recipe.objects.exclude(
+            image=''
+        ).exclude(
+            image__isnull=True
+        ).values_list('image', flat=True).iterator()
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            results = Counter(executor.map(
+                lambda name: build(name, options['force']), names
+            ))
+        self.stdout.write(self.style.SUCCESS(
+            settings.BUILD_IMAGES_RESULT.format(
+                results[BUILT], results[SKIPPED], results[FAILED]
+            )
+        ))
@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.caching import HIT, MISS, get_cache_stats, reset_cache_stats
+
+
+class Command(BaseCommand):
+    help = 'Показывает попадания в кэш списка рецептов'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--prefix',
+            default='recipes',
+            help='Префикс кэшируемого списка'
+        )
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Обнулить счётчики'
+        )
+
+    def handle(self, *args, **options):
+        stats = get_cache_stats(options['prefix'])
+        total = stats[HIT] + stats[MISS]
+        self.stdout.write(settings.CACHE_STATS_RESULT.format(
+            stats[HIT], stats[MISS], stats[HIT] / total if total else 0
+        ))
+        if options['reset']:
+            reset_cache_stats(options['prefix'])
@@ -0,0 +1,80 @@
+import posixpath
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from recipes.images import get_derivative_names
+from recipes.models import Recipe
+
+
+def walk(storage, path):
+    directories, files = storage.listdir(path)
+    for name in files:
+        yield posixpath.join(path, name)
+    for directory in directories:
+        yield from walk(storage, posixpath.join(path, directory))
+
+
+def get_referenced_names():
+    referenced = set()
+    for name in Recipe.objects.exclude(image='').exclude(
+        image__isnull=True
+    ).values_list('image', flat=True).iterator():
+        referenced.add(name)
+        referenced.update(get_derivative_names(name).values())
+    return referenced
+
+
+def is_referenced(name):
+    if name.startswith(settings.RECIPE_IMAGE_DERIVATIVES_DIR + '/'):
+        stem = posixpath.basename(name).rsplit('_', 1)[0]
+        return Recipe.objects.filter(image__contains=stem).exists()
+    return Recipe.objects.filter(image=name).exists()
+
+
+class Command(BaseCommand):
+    help = 'Удаляет файлы изображений, на которые не ссылается ни один рецепт'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--min-age',
+            type=int,
+            default=settings.MEDIA_GC_MIN_AGE,
+            help='Не трогать файлы моложе указанного числа минут'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Только показать, какие файлы будут удалены'
+        )
+
+    def handle(self, *args, **options):
+        field = Recipe._meta.get_field('image')
+        storage = field.storage
+        if not storage.exists(field.upload_to):
+            return
+        threshold = timezone.now() - timedelta(minutes=options['min_age'])
+        referenced = get_referenced_names()
+        removed = kept = 0
+        for name in walk(storage, field.upload_to.rstrip('/')):
+            if name in referenced or storage.get_modified_time(
+                name
+            ) > threshold:
+                kept += 1
+                continue
+            if options['dry_run']:
+                self.stdout.write(name)
+                removed += 1
+                continue
+            if is_referenced(name) or storage.get_modified_time(
+                name
+            ) > threshold:
+                kept += 1
+                continue
+            storage.delete(name)
+            removed += 1
+        self.stdout.write(self.style.SUCCESS(
+            settings.MEDIA_GC_RESULT.format(removed, kept)
+        ))
@@ -1,35 +1,138 @@
 import csv
 import json
+import os
+from itertools import islice
 
 from django.conf import settings
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
 
+from api.caching import bump_version
 from recipes.models import Ingredient, Tag
 
+CHUNK_SIZE = 64 * 1024
+
+
+def read_first_chunk(file):
+    while True:
+        chunk = file.read(CHUNK_SIZE)
+        if not chunk or not chunk.isspace():
+            return chunk.lstrip()
+
+
+def iter_json_array(file):
+    decoder = json.JSONDecoder()
+    buffer = read_first_chunk(file)
+    if not buffer.startswith('['):
+        raise CommandError(settings.LOAD_DATA_WRONG_FORMAT)
+    buffer = buffer[1:]
+    while True:
+        chunk = file.read(CHUNK_SIZE)
+        buffer += chunk
+        position = 0
+        while True:
+            while position < len(buffer) and buffer[position] in ' \t\r\n,':
+                position += 1
+            if buffer[position:position + 1] == ']':
+                return
+            try:
+                item, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                break
+            if end == len(buffer) and chunk:
+                break
+            yield item
+            position = end
+        buffer = buffer[position:]
+        if not chunk:
+            raise CommandError(settings.LOAD_DATA_WRONG_FORMAT)
+
+
+def iter_ingredients(file, extension):
+    if extension == '.json':
+        for item in iter_json_array(file):
+            yield item['name'], item['measurement_unit']
+    else:
+        for row in csv.reader(file):
+            if row:
+                name, measurement_unit = row
+                yield name, measurement_unit
+
+
+def iter_batches(iterable, batch_size):
+    iterator = iter(iterable)
+    batch = list(islice(iterator, batch_size))
+    while batch:
+        yield batch
+        batch = list(islice(iterator, batch_size))
+
 
 class Command(BaseCommand):
-    def handle(self, *args, **options):
-        file = open(
-            'data/ingredients.json',
-            encoding='utf-8'
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default=settings.INGREDIENTS_DATA_PATH,
+            help='Файл ингредиентов в формате .json или .csv'
         )
-        data = json.loads(file.read())
-        for ingredient in data:
-            Ingredient.objects.get_or_create(
-                name=ingredient['name'],
-                measurement_unit=ingredient['measurement_unit']
-            )
-
-        file = open(
-            'data/tags.csv',
-            encoding='utf-8'
+        parser.add_argument(
+            '--tags-path',
+            default=settings.TAGS_DATA_PATH,
+            help='Файл тэгов в формате .csv'
         )
-        data = csv.reader(file)
-        for tag in data:
-            name, color, slug = tag
-            Tag.objects.get_or_create(
-                name=name,
-                color=color,
-                slug=slug
-            )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Количество строк в одном INSERT'
+        )
+
+    def report(self, model, processed, before):
+        inserted = model.objects.count() - before
+        self.stdout.write(settings.LOAD_DATA_RESULT.format(
+            model._meta.verbose_name_plural, inserted, processed - inserted
+        ))
+
+    def load_ingredients(self, path, batch_size):
+        extension = os.path.splitext(path)[1].lower()
+        before = Ingredient.objects.count()
+        processed = 0
+        with open(path, encoding='utf-8-sig', newline='') as file:
+            for batch in iter_batches(
+                iter_ingredients(file, extension), batch_size
+            ):
+                Ingredient.objects.bulk_create(
+                    [
+                        Ingredient(name=name, measurement_unit=unit)
+                        for name, unit in batch
+                    ],
+                    ignore_conflicts=True
+                )
+                processed += len(batch)
+                self.stdout.write(
+                    settings.LOAD_DATA_PROGRESS.format(processed)
+                )
+        self.report(Ingredient, processed, before)
+
+    def load_tags(self, path, batch_size):
+        before = Tag.objects.count()
+        existing = set(Tag.objects.values_list('slug', flat=True))
+        processed = 0
+        with open(path, encoding='utf-8-sig', newline='') as file:
+            for batch in iter_batches(csv.reader(file), batch_size):
+                tags = []
+                for name, color, slug in batch:
+                    if slug not in existing:
+                        existing.add(slug)
+                        tags.append(Tag(name=name, color=color, slug=slug))
+                Tag.objects.bulk_create(tags)
+                processed += len(batch)
+        self.report(Tag, processed, before)
+
+    def handle(self, *args, **options):
+        self.stdout.write(settings.LOAD_DATA_START)
+        with transaction.atomic():
+            self.load_ingredients(options['path'], options['batch_size'])
+            self.load_tags(options['tags_path'], options['batch_size'])
+        bump_version('ingredients')
+        bump_version('tags')
         self.stdout.write(self.style.SUCCESS(settings.LOAD_DATA_SUCCESS))
@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from users.counters import COUNTERS, get_parent_model, recount
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает счётчики рецептов, подписчиков и избранного'
+
+    @transaction.atomic
+    def handle(self, *args, **options):
+        for model, counters in COUNTERS.items():
+            for field, counter in counters.items():
+                parent = get_parent_model(model, field)
+                recount(model, field, counter)
+                self.stdout.write(settings.RECOUNT_RESULT.format(
+                    parent._meta.verbose_name_plural,
+                    parent._meta.get_field(counter).verbose_name
+                ))
+        self.stdout.write(self.style.SUCCESS(settings.RECOUNT_SUCCESS))
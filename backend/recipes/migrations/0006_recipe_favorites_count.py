@@ -0,0 +1,27 @@
+# Generated by Django 3.2.25 on 2026-10-18 02:59
+
+from django.db import migrations, models
+
+from users.counters import recount
+
+
+def fill_counters(apps, schema_editor):
+    recount(apps.get_model('recipes', 'Recipe'), 'author', 'recipes_count')
+    recount(apps.get_model('recipes', 'Favorite'), 'recipe', 'favorites_count')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0005_recipe_pub_date'),
+        ('users', '0002_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipe',
+            name='favorites_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Избранное'),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
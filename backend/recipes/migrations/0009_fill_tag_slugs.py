@@ -0,0 +1,24 @@
+# Generated by Django 3.2.25 on 2026-10-18 03:12
+
+from django.db import migrations
+
+
+def fill_slugs(apps, schema_editor):
+    Tag = apps.get_model('recipes', 'Tag')
+    seen = set()
+    for tag in Tag.objects.order_by('id'):
+        if not tag.slug or tag.slug in seen:
+            tag.slug = f'tag-{tag.id}'
+            tag.save(update_fields=['slug'])
+        seen.add(tag.slug)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0008_recipe_search'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_slugs, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 3.2.25 on 2026-10-18 03:12
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0009_fill_tag_slugs'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='tag',
+            name='slug',
+            field=models.SlugField(max_length=200, unique=True, validators=[django.core.validators.RegexValidator(message='Можно использовать цифры и латинские буквы. Не более 200 символов', regex='^[-a-zA-Z0-9_]+$')], verbose_name='Уникальный идентификатор'),
+        ),
+    ]
@@ -2,6 +2,8 @@ from django.conf import settings
 from django.core.validators import MinValueValidator, RegexValidator
 from django.db import models
 
+from recipes.storage import ContentHashedStorage
+from users.counters import CounterQuerySet
 from users.models import User
 
 
@@ -19,17 +21,16 @@ class Tag(models.Model):
         null=True,
         default='#ffffff'
     )
-    slug = models.TextField(
+    slug = models.SlugField(
         'Уникальный идентификатор',
         max_length=settings.SLUG_MAX_LENGTH,
+        unique=True,
         validators=[
             RegexValidator(
                 regex=r'^[-a-zA-Z0-9_]+$',
                 message=settings.SLUG_ERROR,
             ),
         ],
-        blank=True,
-        null=True,
     )
 
     class Meta:
@@ -68,6 +69,32 @@ class Ingredient(models.Model):
         return self.name[:15]
 
 
+def recipe_prefetches():
+    return (
+        models.Prefetch(
+            'tags',
+            queryset=Tag.objects.only('id', 'name', 'color', 'slug')
+        ),
+        models.Prefetch(
+            'ingredient_recipe',
+            queryset=IngredientRecipe.objects.select_related(
+                'ingredient'
+            ).only(
+                'id', 'recipe', 'amount',
+                'ingredient__id', 'ingredient__name',
+                'ingredient__measurement_unit'
+            )
+        ),
+    )
+
+
+class RecipeQuerySet(CounterQuerySet):
+    def with_related(self):
+        return self.select_related('author').prefetch_related(
+            *recipe_prefetches()
+        )
+
+
 class Recipe(models.Model):
     ingredients = models.ManyToManyField(
         Ingredient,
@@ -83,6 +110,7 @@ class Recipe(models.Model):
     image = models.ImageField(
         verbose_name='Изображение',
         upload_to='recipes/',
+        storage=ContentHashedStorage(),
         editable=True,
         blank=True,
         null=True,
@@ -106,11 +134,28 @@ class Recipe(models.Model):
         related_name='recipes',
         verbose_name='Автор',
     )
+    pub_date = models.DateTimeField(
+        'Дата публикации',
+        auto_now_add=True,
+    )
+    favorites_count = models.PositiveIntegerField(
+        'Избранное',
+        default=0,
+        editable=False
+    )
+
+    objects = RecipeQuerySet.as_manager()
 
     class Meta:
-        ordering = ('author',)
+        ordering = ('-pub_date', '-id')
         verbose_name = 'Рецепт'
         verbose_name_plural = 'Рецепты'
+        indexes = [
+            models.Index(
+                fields=['-pub_date', '-id'],
+                name='recipe_pub_date_idx'
+            )
+        ]
 
     def __str__(self):
         return self.name[:15]
@@ -168,6 +213,7 @@ class RecipeBase(models.Model):
     user = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
+        db_index=False,
         verbose_name='Пользователь'
     )
     recipe = models.ForeignKey(
@@ -181,6 +227,8 @@ class RecipeBase(models.Model):
 
 
 class Favorite(RecipeBase):
+    objects = CounterQuerySet.as_manager()
+
     class Meta(RecipeBase.Meta):
         default_related_name = 'favorite'
         constraints = [
@@ -0,0 +1,115 @@
+import re
+
+from django.db import connections
+from django.db.models import FloatField, Q
+from django.db.models.expressions import RawSQL
+
+SEARCH_CONFIG = 'russian'
+FTS_TABLE = 'recipes_recipe_fts'
+
+CREATE_SQL = {
+    'postgresql': (
+        'ALTER TABLE recipes_recipe ADD COLUMN search_vector tsvector '
+        'GENERATED ALWAYS AS ('
+        f"setweight(to_tsvector('{SEARCH_CONFIG}', "
+        "coalesce(name, '')), 'A') || "
+        f"setweight(to_tsvector('{SEARCH_CONFIG}', "
+        "coalesce(text, '')), 'B')"
+        ') STORED',
+        'CREATE INDEX recipe_search_idx ON recipes_recipe '
+        'USING gin (search_vector)',
+    ),
+    'sqlite': (
+        f'CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5('
+        "name, text, content='recipes_recipe', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2')",
+        f'CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON recipes_recipe '
+        f'BEGIN INSERT INTO {FTS_TABLE}(rowid, name, text) '
+        'VALUES (new.id, new.name, new.text); END',
+        f'CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON recipes_recipe '
+        f'BEGIN INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, text) '
+        "VALUES ('delete', old.id, old.name, old.text); END",
+        f'CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE OF name, text '
+        'ON recipes_recipe '
+        f'BEGIN INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, text) '
+        "VALUES ('delete', old.id, old.name, old.text); "
+        f'INSERT INTO {FTS_TABLE}(rowid, name, text) '
+        'VALUES (new.id, new.name, new.text); END',
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+    ),
+}
+DROP_SQL = {
+    'postgresql': (
+        'DROP INDEX IF EXISTS recipe_search_idx',
+        'ALTER TABLE recipes_recipe DROP COLUMN IF EXISTS search_vector',
+    ),
+    'sqlite': (
+        f'DROP TRIGGER IF EXISTS {FTS_TABLE}_ai',
+        f'DROP TRIGGER IF EXISTS {FTS_TABLE}_ad',
+        f'DROP TRIGGER IF EXISTS {FTS_TABLE}_au',
+        f'DROP TABLE IF EXISTS {FTS_TABLE}',
+    ),
+}
+
+
+def get_terms(value):
+    return re.findall(r'\w+', value)
+
+
+def order_by_rank(queryset, rank):
+    return queryset.annotate(rank=rank).order_by(
+        '-rank', *queryset.model._meta.ordering
+    )
+
+
+def search_postgresql(queryset, value):
+    from django.contrib.postgres.search import (
+        SearchQuery, SearchRank, SearchVectorField
+    )
+
+    vector = RawSQL(
+        'recipes_recipe.search_vector', (),
+        output_field=SearchVectorField()
+    )
+    query = SearchQuery(value, config=SEARCH_CONFIG, search_type='websearch')
+    return order_by_rank(
+        queryset.alias(search=vector).filter(search=query),
+        SearchRank(vector, query)
+    )
+
+
+def search_sqlite(queryset, value):
+    match = ' '.join(f'"{term}"*' for term in get_terms(value))
+    if not match:
+        return queryset.none()
+    return order_by_rank(
+        queryset.filter(id__in=RawSQL(
+            f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+            (match,)
+        )),
+        RawSQL(
+            f'SELECT -bm25({FTS_TABLE}, 10.0, 1.0) FROM {FTS_TABLE} '
+            f'WHERE {FTS_TABLE} MATCH %s '
+            f'AND {FTS_TABLE}.rowid = recipes_recipe.id',
+            (match,),
+            output_field=FloatField()
+        )
+    )
+
+
+def search_fallback(queryset, value):
+    return queryset.filter(
+        Q(name__icontains=value) | Q(text__icontains=value)
+    )
+
+
+SEARCH_BACKENDS = {
+    'postgresql': search_postgresql,
+    'sqlite': search_sqlite,
+}
+
+
+def search_recipes(queryset, value):
+    return SEARCH_BACKENDS.get(
+        connections[queryset.db].vendor, search_fallback
+    )(queryset, value)
@@ -0,0 +1,29 @@
+import hashlib
+import os
+import posixpath
+
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+
+@deconstructible
+class ContentHashedStorage(FileSystemStorage):
+    def get_hashed_name(self, name, content):
+        digest = hashlib.sha256()
+        content.seek(0)
+        for chunk in content.chunks():
+            digest.update(chunk)
+        content.seek(0)
+        digest = digest.hexdigest()
+        return posixpath.join(
+            posixpath.dirname(name),
+            digest[:2],
+            digest + posixpath.splitext(name)[1].lower()
+        )
+
+    def save(self, name, content, max_length=None):
+        name = self.get_hashed_name(name, content)
+        if self.exists(name):
+            os.utime(self.path(name), None)
+            return name
+        return super().save(name, content, max_length=max_length)
@@ -0,0 +1,57 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from recipes.management.commands import loaddata
+from recipes.management.commands.loaddata import iter_json_array
+from recipes.models import Ingredient
+
+ITEMS = [
+    {'name': f'ингредиент «{number}»', 'measurement_unit': 'г'}
+    for number in range(10)
+]
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 7, 64 * 1024])
+def test_iter_json_array_splits_objects_across_chunks(
+    monkeypatch, chunk_size
+):
+    monkeypatch.setattr(loaddata, 'CHUNK_SIZE', chunk_size)
+    data = ' \n' + json.dumps(ITEMS, ensure_ascii=False, indent=2)
+    assert list(iter_json_array(StringIO(data))) == ITEMS
+
+
+@pytest.mark.parametrize('data', ['[]', ' [ ] ', '[\n]\n'])
+def test_iter_json_array_empty(data):
+    assert list(iter_json_array(StringIO(data))) == []
+
+
+@pytest.mark.parametrize('data', [
+    '{"name": "соль"}',
+    '',
+    '[{"name": "соль"}',
+    '[{"name": "со',
+    '[{"name": "соль"}, ',
+])
+def test_iter_json_array_wrong_format(monkeypatch, data):
+    monkeypatch.setattr(loaddata, 'CHUNK_SIZE', 4)
+    with pytest.raises(CommandError):
+        list(iter_json_array(StringIO(data)))
+
+
+def test_loaddata_skips_duplicates(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(loaddata, 'CHUNK_SIZE', 16)
+    path = tmp_path / 'ingredients.json'
+    path.write_text(
+        json.dumps(ITEMS + ITEMS[:3], ensure_ascii=False), encoding='utf-8'
+    )
+    tags_path = tmp_path / 'tags.csv'
+    tags_path.write_text('Завтрак,#E26C2D,breakfast\n', encoding='utf-8')
+    call_command(
+        'loaddata', path=str(path), tags_path=str(tags_path),
+        batch_size=4, stdout=StringIO()
+    )
+    assert Ingredient.objects.count() == len(ITEMS)
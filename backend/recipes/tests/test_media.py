@@ -0,0 +1,41 @@
+import os
+import time
+from io import StringIO
+
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+
+from recipes.management.commands import collect_media_garbage
+from recipes.models import Recipe
+
+OLD = time.time() - 24 * 60 * 60
+
+
+def make_old(storage, name):
+    os.utime(storage.path(name), (OLD, OLD))
+
+
+def test_dedup_hit_refreshes_mtime():
+    storage = Recipe._meta.get_field('image').storage
+    name = storage.save('recipes/photo.jpg', ContentFile(b'photo'))
+    make_old(storage, name)
+    assert storage.save('recipes/copy.JPG', ContentFile(b'photo')) == name
+    assert os.path.getmtime(storage.path(name)) > OLD
+
+
+def test_garbage_is_rechecked_before_delete(make_recipes, monkeypatch):
+    storage = Recipe._meta.get_field('image').storage
+    reused = storage.save('recipes/reused.jpg', ContentFile(b'reused'))
+    orphan = storage.save('recipes/orphan.jpg', ContentFile(b'orphan'))
+    make_old(storage, reused)
+    make_old(storage, orphan)
+    # the recipe is saved after the referenced names were collected
+    monkeypatch.setattr(
+        collect_media_garbage, 'get_referenced_names', lambda: set()
+    )
+    Recipe.objects.filter(
+        pk=make_recipes(1)[0].pk
+    ).update(image=reused)
+    call_command('collect_media_garbage', stdout=StringIO())
+    assert storage.exists(reused)
+    assert not storage.exists(orphan)
@@ -0,0 +1,53 @@
+import pytest
+
+from recipes.models import Recipe
+
+RECIPES_URL = '/api/recipes/'
+
+
+@pytest.fixture
+def make_recipe(author):
+    def make(name, text):
+        return Recipe.objects.create(
+            author=author, name=name, text=text, cooking_time=10
+        )
+    return make
+
+
+def search(client, value):
+    response = client.get(RECIPES_URL, {'search': value})
+    assert response.status_code == 200
+    return [recipe['id'] for recipe in response.json()['results']]
+
+
+def test_search_matches_name_and_text(user_client, make_recipe):
+    soup = make_recipe('Грибной суп', 'Сварить бульон')
+    porridge = make_recipe('Каша', 'Добавить изюм')
+    make_recipe('Омлет', 'Взбить яйца')
+    assert search(user_client, 'грибной') == [soup.id]
+    assert search(user_client, 'изюм') == [porridge.id]
+
+
+def test_name_hits_rank_above_text_hits(user_client, make_recipe):
+    soup = make_recipe('Суп', 'Сварить бульон')
+    bread = make_recipe('Хлеб', 'Подавать к супу или суп к нему')
+    assert search(user_client, 'суп') == [soup.id, bread.id]
+
+
+def test_search_follows_updates_and_deletes(user_client, make_recipe):
+    recipe = make_recipe('Борщ', 'Сварить бульон')
+    recipe.name = 'Щи'
+    recipe.save()
+    assert search(user_client, 'борщ') == []
+    assert search(user_client, 'щи') == [recipe.id]
+    recipe.delete()
+    assert search(user_client, 'щи') == []
+
+
+@pytest.mark.parametrize('value', ['!!!', '"*"', ' - '])
+def test_search_without_words_is_empty(user_client, make_recipe, value):
+    make_recipe('Суп', 'Сварить бульон')
+    response = user_client.get(RECIPES_URL, {'search': value})
+    assert response.status_code == 200
+    assert response.json()['count'] == 0
+    assert response.json()['results'] == []
@@ -3,3 +3,9 @@ from django.apps import AppConfig
 
 class UsersConfig(AppConfig):
     name = 'users'
+
+    def ready(self):
+        from users.counters import register_counter
+        from users.models import Follow
+
+        register_counter(Follow, 'author', 'followers_count')
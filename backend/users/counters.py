@@ -0,0 +1,108 @@
+from collections import defaultdict
+
+from django.db import models
+from django.db.models.functions import Coalesce, Greatest
+from django.db.models.signals import post_delete, post_save, pre_save
+
+COUNTERS = defaultdict(dict)
+OLD_PARENTS_ATTR = '_counter_old_parents'
+
+
+def get_parent_model(model, field):
+    return model._meta.get_field(field).related_model
+
+
+def change_counter(model, field, counter, pk, delta):
+    value = models.F(counter) + delta
+    if delta < 0:
+        value = Greatest(value, 0)
+    get_parent_model(model, field).objects.filter(pk=pk).update(
+        **{counter: value}
+    )
+
+
+def get_parent_pk(model, field, instance):
+    return getattr(instance, model._meta.get_field(field).attname)
+
+
+def recount(model, field, counter, pks=None):
+    parents = get_parent_model(model, field).objects.all()
+    if pks is not None:
+        parents = parents.filter(pk__in=pks)
+    return parents.update(**{counter: Coalesce(
+        models.Subquery(
+            model.objects.filter(
+                **{field: models.OuterRef('pk')}
+            ).order_by().values(field).annotate(
+                total=models.Count('pk')
+            ).values('total')
+        ),
+        0
+    )})
+
+
+def remember_parents(sender, instance, raw=False, update_fields=None,
+                     **kwargs):
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    fields = [
+        field for field in COUNTERS[sender]
+        if update_fields is None or field in update_fields
+        or sender._meta.get_field(field).attname in update_fields
+    ]
+    if not fields:
+        return
+    old = sender.objects.filter(pk=instance.pk).values(
+        *(sender._meta.get_field(field).attname for field in fields)
+    ).first()
+    if old is not None:
+        setattr(instance, OLD_PARENTS_ATTR, {
+            field: old[sender._meta.get_field(field).attname]
+            for field in fields
+        })
+
+
+def increment_counters(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        for field, counter in COUNTERS[sender].items():
+            change_counter(
+                sender, field, counter,
+                get_parent_pk(sender, field, instance), 1
+            )
+        return
+    old_parents = instance.__dict__.pop(OLD_PARENTS_ATTR, {})
+    for field, old_pk in old_parents.items():
+        new_pk = get_parent_pk(sender, field, instance)
+        if old_pk != new_pk:
+            counter = COUNTERS[sender][field]
+            change_counter(sender, field, counter, old_pk, -1)
+            change_counter(sender, field, counter, new_pk, 1)
+
+
+def decrement_counters(sender, instance, **kwargs):
+    for field, counter in COUNTERS[sender].items():
+        change_counter(
+            sender, field, counter,
+            get_parent_pk(sender, field, instance), -1
+        )
+
+
+def register_counter(model, field, counter):
+    COUNTERS[model][field] = counter
+    pre_save.connect(remember_parents, sender=model)
+    post_save.connect(increment_counters, sender=model)
+    post_delete.connect(decrement_counters, sender=model)
+
+
+class CounterQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = super().bulk_create(objs, *args, **kwargs)
+        for field, counter in COUNTERS[self.model].items():
+            attname = self.model._meta.get_field(field).attname
+            recount(
+                self.model, field, counter,
+                {getattr(obj, attname) for obj in objs}
+            )
+        return objs
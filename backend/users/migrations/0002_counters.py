@@ -0,0 +1,30 @@
+# Generated by Django 3.2.25 on 2026-10-18 02:59
+
+from django.db import migrations, models
+
+from users.counters import recount
+
+
+def fill_counters(apps, schema_editor):
+    recount(apps.get_model('users', 'Follow'), 'author', 'followers_count')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='followers_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Подписчики'),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='recipes_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Рецепты'),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
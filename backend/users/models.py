@@ -2,6 +2,7 @@ from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 
+from .counters import CounterQuerySet
 from .validators import username_validator
 
 
@@ -33,6 +34,16 @@ class User(AbstractUser):
         'Пароль',
         max_length=settings.TEXT_MAX_LENGTH
     )
+    recipes_count = models.PositiveIntegerField(
+        'Рецепты',
+        default=0,
+        editable=False
+    )
+    followers_count = models.PositiveIntegerField(
+        'Подписчики',
+        default=0,
+        editable=False
+    )
 
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['username', 'first_name', 'last_name', 'password']
@@ -60,6 +71,8 @@ class Follow(models.Model):
         verbose_name='Автор'
     )
 
+    objects = CounterQuerySet.as_manager()
+
     class Meta:
         verbose_name = 'Подписка',
         verbose_name_plural = 'Подписки'
@@ -0,0 +1,60 @@
+from recipes.models import Favorite, Recipe
+from users.models import Follow
+
+
+def refresh(*objects):
+    for obj in objects:
+        obj.refresh_from_db()
+
+
+def test_counters_follow_create_and_delete(user, author, make_recipes):
+    recipe = make_recipes(1)[0]
+    Favorite.objects.create(user=user, recipe=recipe)
+    Follow.objects.create(user=user, author=author)
+    refresh(author, recipe)
+    assert author.recipes_count == 1
+    assert author.followers_count == 1
+    assert recipe.favorites_count == 1
+    recipe.delete()
+    refresh(author)
+    assert author.recipes_count == 0
+
+
+def test_counters_move_with_foreign_key(user, author, make_recipes):
+    first, second = make_recipes(2)
+    recipe = Recipe.objects.get(pk=first.pk)
+    recipe.author = user
+    recipe.save()
+    refresh(user, author)
+    assert (user.recipes_count, author.recipes_count) == (1, 1)
+    favorite = Favorite.objects.create(user=user, recipe=first)
+    favorite.recipe = second
+    favorite.save()
+    refresh(first, second)
+    assert (first.favorites_count, second.favorites_count) == (0, 1)
+    other = type(user).objects.create_user(
+        username='other', email='other@example.com', password='password'
+    )
+    follow = Follow.objects.create(user=user, author=author)
+    follow.author = other
+    follow.save()
+    refresh(author, other)
+    assert (author.followers_count, other.followers_count) == (0, 1)
+
+
+def test_counters_do_not_go_below_zero(user, make_recipes):
+    recipe = make_recipes(1)[0]
+    recipe.author = user
+    recipe.save()
+    type(user).objects.filter(pk=user.pk).update(recipes_count=0)
+    recipe.delete()
+    refresh(user)
+    assert user.recipes_count == 0
+
+
+def test_save_without_author_change_keeps_counters(author, make_recipes):
+    recipe = make_recipes(1)[0]
+    recipe.name = 'Другое название'
+    recipe.save()
+    refresh(author)
+    assert author.recipes_count == 1